@@ -8,13 +8,28 @@ from nonebot.plugin import PluginMetadata, inherit_supported_adapters, require
 require("nonebot_plugin_alconna")
 require("nonebot_plugin_waiter")
 require("nonebot_plugin_localstore")
-require("nonebot_plugin_htmlrender")
 
-from . import interaction as interaction
 from .config import ConfigModel, config
+
+if config.render_backend == "browser":
+    require("nonebot_plugin_htmlrender")
+
+from . import interaction as interaction
 from .const import SONG_CACHE_DIR
-from .data_source import login, registered_searcher
+from .data_source import (
+    login_manager,
+    metadata_store,
+    registered_searcher,
+    transport,
+)
 from .interaction import load_commands
+from .render import (
+    cover_file_cache,
+    page_pool,
+    render_cache,
+    warmup_page_pool,
+)
+from .utils import ffmpeg_prober, http_clients, song_file_cache
 
 if config.clean_cache_on_startup:
     import shutil
@@ -27,7 +42,26 @@ driver = get_driver()
 
 @driver.on_startup
 async def _():
-    asyncio.create_task(login())
+    login_manager.start()
+    song_file_cache.start()
+    ffmpeg_prober.start()
+    asyncio.create_task(warmup_page_pool())
+    if render_cache.disk_size > 0:
+        render_cache.disk.start()
+    cover_file_cache.start()
+
+
+@driver.on_shutdown
+async def _():
+    await login_manager.stop()
+    song_file_cache.stop()
+    ffmpeg_prober.stop()
+    render_cache.disk.stop()
+    cover_file_cache.stop()
+    await page_pool.close()
+    await transport.aclose()
+    await http_clients.aclose()
+    metadata_store.close()
 
 
 load_commands()
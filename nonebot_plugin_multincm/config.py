@@ -1,9 +1,9 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
 from cookit.pyd import model_with_model_config
 from nonebot import get_plugin_config
-from nonebot.compat import PYDANTIC_V2
-from pydantic import AnyHttpUrl, BaseModel, ConfigDict
+from nonebot.compat import PYDANTIC_V2, model_fields
+from pydantic import AnyHttpUrl, BaseModel, ConfigDict, Field
 
 
 def alias_generator(x: str):
@@ -15,6 +15,21 @@ if PYDANTIC_V2:
     model_config["coerce_numbers_to_str"] = True
 
 
+class MetadataCacheTTL(BaseModel):
+    song: int = 86400
+    album: int = 86400
+    playlist: int = 3600
+    radio: int = 3600
+    program: int = 86400
+    lyrics: int = 86400
+
+    def get(self, kind: str) -> int:
+        return getattr(self, kind)
+
+    def kinds(self) -> list[str]:
+        return [x.name for x in model_fields(type(self))]
+
+
 @model_with_model_config(model_config)
 class ConfigModel(BaseModel):
     # login
@@ -28,8 +43,18 @@ class ConfigModel(BaseModel):
 
     # ui
     list_limit: int = 20
+    list_prefetch: bool = True
+    list_prefetch_previous: bool = False
+    list_prefetch_concurrency: int = 1
     list_font: str | None = None
+    render_backend: Literal["browser", "pillow"] = "browser"
+    list_cover_inline: bool = True
+    list_cover_timeout: float = 3
     lrc_empty_line: str | None = "-"
+    render_page_pool_size: int = 2
+    render_page_max_uses: int = 100
+    render_cache_size: float = 64
+    render_cache_disk_size: float = 0
 
     # interaction
     auto_resolve: bool = False
@@ -51,15 +76,42 @@ class ConfigModel(BaseModel):
     ob_v11_local_mode: bool = True
     ob_v11_ignore_send_file_failure: bool = False
 
+    # request
+    transport: Literal["httpx", "pyncm"] = "httpx"
+    request_timeout: float = 10
+    http_timeout: float = 30
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30
+    http2: bool = True
+    request_batch_delay: float = 0.05
+    request_batch_size: int = 100
+    metadata_cache: bool = True
+    metadata_cache_ttl: MetadataCacheTTL = Field(default_factory=MetadataCacheTTL)
+
     # other
     msg_cache_size: int = 1024
     msg_cache_time: int = 43200
     resolve_cool_down_cache_size: int = 1024
+    song_info_cache_size: int = 1024
+    song_info_cache_time: int = 600
+    search_cache_size: int = 256
+    search_cache_time: int = 300
+    track_cache_size: int = 4096
+    playlist_cache_size: int = 32
+    playlist_hydrate_chunk_size: int = 500
+    lyrics_cache_size: int = 256
     card_sign_url: Annotated[str, AnyHttpUrl] | None = None
     card_sign_timeout: int = 5
     ffmpeg_executable: str = "ffmpeg"
+    ffmpeg_probe_interval: int = 3600
+    transcode_concurrency: int | None = None
     safe_filename: bool = True
-    clean_cache_on_startup: bool = True
+    clean_cache_on_startup: bool = False
+    song_cache_max_size: float = 1024
+    song_cache_max_age: int = 604800
+    song_cache_evict_interval: int = 600
+    cover_cache_size: float = 64
 
 
 config = get_plugin_config(ConfigModel)
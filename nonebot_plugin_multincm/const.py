@@ -9,6 +9,8 @@ ensure_localstore_path_config()
 DATA_DIR = get_plugin_data_dir()
 CACHE_DIR = get_plugin_cache_dir()
 SONG_CACHE_DIR = CACHE_DIR / "songs"
+RENDER_CACHE_DIR = CACHE_DIR / "render"
+COVER_CACHE_DIR = CACHE_DIR / "covers"
 
 URL_REGEX = r"music\.163\.com/(.*?)(?P<type>[a-zA-Z]+)(/?\?id=|/)(?P<id>[0-9]+)&?"
 SHORT_URL_BASE = "https://163cn.tv"
@@ -16,6 +18,7 @@ SHORT_URL_REGEX = r"163cn\.tv/(?P<suffix>[a-zA-Z0-9]+)"
 
 SESSION_FILE_NAME = "session.cache"
 SESSION_FILE_PATH = DATA_DIR / SESSION_FILE_NAME
+METADATA_DB_PATH = DATA_DIR / "metadata.db"
 
 
 def migrate_old_data_1_2_2():
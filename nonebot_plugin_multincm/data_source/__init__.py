@@ -30,6 +30,11 @@ from .base import (
     registered_song as registered_song,
     resolve_from_link_params as resolve_from_link_params,
 )
+from .lyrics import (
+    CachedLyrics as CachedLyrics,
+    get_song_lyrics as get_song_lyrics,
+    lyrics_cache as lyrics_cache,
+)
 from .playlist import (
     Playlist as Playlist,
     PlaylistListPage as PlaylistListPage,
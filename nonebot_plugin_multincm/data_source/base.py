@@ -1,6 +1,6 @@
 import asyncio
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import Awaitable, Callable, Iterable
 from contextlib import suppress
 from dataclasses import dataclass, field
 from typing import (
@@ -14,12 +14,15 @@ from typing import (
 )
 from typing_extensions import Self, override
 
+from cachetools import TTLCache
+from cookit.loguru import warning_suppress
 from yarl import URL
 
 from ..config import config
 from ..utils import (
     FILESYSTEM_CHAR_REPLACEMENTS,
     NCMLrcGroupLine,
+    SingleFlight,
     build_item_link,
     calc_max_page,
     calc_min_index,
@@ -49,6 +52,22 @@ registered_song: set[type["BaseSong"]] = set()
 registered_playlist: set[type["BasePlaylist"]] = set()
 registered_searcher: dict[type["BaseSearcher"], tuple[str, ...]] = {}
 
+song_info_cache: TTLCache[tuple[str, int], "SongInfo"] = TTLCache(
+    config.song_info_cache_size,
+    config.song_info_cache_time,
+)
+song_info_flight: SingleFlight[tuple[str, int], "SongInfo"] = SingleFlight()
+
+# (searcher type, normalized keyword, page, list limit) -> raw search response
+SearchCacheKey: TypeAlias = tuple[str, str, int, int]
+search_cache: TTLCache[SearchCacheKey, Any] = TTLCache(
+    max(config.search_cache_size, 1),
+    config.search_cache_time,
+)
+search_flight: SingleFlight[SearchCacheKey, Any] = SingleFlight()
+
+PrefetchCallback: TypeAlias = Callable[["BaseSongListPage[Any, Any]"], Awaitable[Any]]
+
 
 class ResolvableFromID(ABC):
     link_types: ClassVar[tuple[str, ...]]
@@ -189,7 +208,7 @@ class BaseSong(ResolvableFromID, ABC, Generic[_TRawResp]):
     @abstractmethod
     async def get_lyrics(self) -> list[NCMLrcGroupLine] | None: ...
 
-    async def get_info(self) -> SongInfo:
+    async def _fetch_info(self) -> SongInfo:
         (
             (name, alias, artists, duration, url, cover_url),
             (playable_url,),
@@ -217,6 +236,18 @@ class BaseSong(ResolvableFromID, ABC, Generic[_TRawResp]):
             playable_url=playable_url,
         )
 
+    async def get_info(self) -> SongInfo:
+        key = (type(self).__name__, self.id)
+        if info := song_info_cache.get(key):
+            return info
+
+        async def fetch():
+            info = await self._fetch_info()
+            song_info_cache[key] = info
+            return info
+
+        return await song_info_flight.run(key, fetch)
+
     @classmethod
     def is_info_from_cls(cls, info: SongInfo) -> TypeGuard[SongInfo[Self]]:
         return isinstance(info.father, cls)
@@ -242,6 +273,8 @@ class ListPageCard:
 class BaseSongListPage(Generic[_TRawRespInner, _TSongList_co]):
     content: Iterable[_TRawRespInner]
     father: _TSongList_co
+    page: int | None = None
+    """Page number of this page, `None` means `father.current_page`"""
 
     @override
     def __str__(self) -> str:
@@ -267,6 +300,10 @@ class BaseSongList(ABC, Generic[_TRawResp, _TRawRespInner, _TSongOrList]):
         self.current_page: int = 1
         self._total_count: int | None = None
         self._cache: dict[int, _TRawRespInner] = {}
+        # page -> (content, total count)
+        self._page_cache: dict[int, tuple[list[_TRawRespInner] | None, int]] = {}
+        self._page_flight: SingleFlight[int, _TRawResp] = SingleFlight()
+        self._prefetch_tasks: dict[int, asyncio.Task[None]] = {}
 
     def __str__(self) -> str:
         return (
@@ -316,10 +353,71 @@ class BaseSongList(ABC, Generic[_TRawResp, _TRawRespInner, _TSongOrList]):
         resp: Iterable[_TRawRespInner],
     ) -> BaseSongListPage[_TRawRespInner, Self]: ...
 
+    async def _request_page(self, page: int) -> _TRawResp:
+        return await self._do_get_page(page)
+
     def _update_cache(self, page: int, data: list[_TRawRespInner]):
         min_index = calc_min_index(page)
         self._cache.update({min_index + i: item for i, item in enumerate(data)})
 
+    def _is_page_cached(self, page: int) -> bool:
+        return page in self._page_cache
+
+    async def _fetch_page(self, page: int) -> list[_TRawRespInner] | None:
+        # does not move `current_page`, so it is also used by prefetch
+        if (cached := self._page_cache.get(page)) is not None:
+            content, self._total_count = cached
+            return content
+
+        resp = await self._page_flight.run(page, lambda: self._request_page(page))
+        content = await self._extract_resp_content(resp)
+        self._total_count = total_count = await self._extract_total_count(resp)
+        self._page_cache[page] = (content, total_count)
+        if content:
+            self._update_cache(page, content)
+        return content
+
+    async def _prefetch_page(
+        self,
+        page: int,
+        callback: PrefetchCallback | None,
+    ):
+        with warning_suppress(f"Failed to prefetch page {page} of {self}"):
+            content = await self._fetch_page(page)
+            if callback and content and len(content) > 1:
+                list_page = await self._build_list_page(content)
+                list_page.page = page
+                await callback(list_page)
+
+    def prefetch(
+        self,
+        callback: PrefetchCallback | None = None,
+    ) -> None:
+        # fetch pages around `current_page` in background,
+        # `callback` receives the built list page, e.g. to render it ahead
+        if (not config.list_prefetch) or (self._total_count is None):
+            return
+        pages = [self.current_page + 1]
+        if config.list_prefetch_previous:
+            pages.append(self.current_page - 1)
+        for page in pages:
+            if len(self._prefetch_tasks) >= config.list_prefetch_concurrency:
+                break
+            if (
+                (not self.page_valid(page))
+                or (page in self._prefetch_tasks)
+                or self._is_page_cached(page)
+            ):
+                continue
+            task = asyncio.create_task(self._prefetch_page(page, callback))
+            self._prefetch_tasks[page] = task
+            task.add_done_callback(lambda _, p=page: self._prefetch_tasks.pop(p, None))
+
+    def cancel_prefetch(self) -> None:
+        for task in self._prefetch_tasks.values():
+            task.cancel()
+        self._prefetch_tasks.clear()
+
     def page_valid(self, page: int) -> bool:
         return 1 <= page <= self.max_page
 
@@ -335,24 +433,12 @@ class BaseSongList(ABC, Generic[_TRawResp, _TRawRespInner, _TSongOrList]):
         if not ((not self._total_count) or self.page_valid(page)):
             raise ValueError("Page out of range")
 
-        min_index = calc_min_index(page)
-        max_index = min_index + config.list_limit
-        index_range = range(min_index, max_index + 1)
-        if all(page in self._cache for page in index_range):
-            return await self._build_list_page(
-                self._cache[page] for page in index_range
-            )
-
-        resp = await self._do_get_page(page)
-        content = await self._extract_resp_content(resp)
-        self._total_count = await self._extract_total_count(resp)
+        content = await self._fetch_page(page)
         self.current_page = page
         if content is None:
             return None
         if len(content) == 1:
             return await self._build_selection(content[0])
-
-        self._cache.update({min_index + i: item for i, item in enumerate(content)})
         return await self._build_list_page(content)
 
     async def select(self, index: int) -> _TSongOrList:
@@ -362,10 +448,9 @@ class BaseSongList(ABC, Generic[_TRawResp, _TRawRespInner, _TSongOrList]):
         elif not (1 <= page_num <= self.max_page):
             raise ValueError("Index out of range")
         else:
-            resp = await self._extract_resp_content(await self._do_get_page(page_num))
+            resp = await self._fetch_page(page_num)
             if resp is None:
                 raise ValueError("Empty response, index may out of range")
-            self._update_cache(page_num, resp)
             min_index = calc_min_index(page_num)
             content = resp[index - min_index]
         return await self._build_selection(content)
@@ -479,12 +564,35 @@ class BaseSearcher(BaseSongList[_TRawResp, _TRawRespInner, _TSongOrList]):
     @abstractmethod
     async def search_from_id(arg_id: int) -> _TSongOrList | None: ...
 
+    @property
+    def normalized_keyword(self) -> str:
+        return " ".join(self.keyword.split()).casefold()
+
+    @override
+    async def _request_page(self, page: int) -> _TRawResp:
+        if config.search_cache_size <= 0:
+            return await super()._request_page(page)
+
+        key = (type(self).__name__, self.normalized_keyword, page, config.list_limit)
+        if (resp := search_cache.get(key)) is not None:
+            return resp
+
+        request = super()._request_page
+
+        async def fetch():
+            resp = await request(page)
+            search_cache[key] = resp
+            return resp
+
+        return await search_flight.run(key, fetch)
+
     @override
     async def get_page(
         self,
         page: int | None = None,
     ) -> BaseSongListPage[_TRawRespInner, Self] | _TSongOrList | None:
-        if self.keyword.isdigit():
+        # only try to treat keyword as id on the first search
+        if self.keyword.isdigit() and self._total_count is None:
             with suppress(Exception):
                 if song := await self.search_from_id(int(self.keyword)):
                     return song
@@ -0,0 +1,125 @@
+import time
+from dataclasses import dataclass
+
+from cachetools import LRUCache
+from pydantic import BaseModel
+
+from ..config import config
+from ..utils import LrcGroupLine, NCMLrcGroupLine, SingleFlight, normalize_lrc
+from .raw import get_track_lrc, md, metadata_store
+
+LyricVersions = tuple[int, int, int]
+
+
+class CachedLyricLine(BaseModel):
+    time: int
+    lrc: dict[str, str]
+
+
+class CachedLyrics(BaseModel):
+    versions: list[int]
+    empty_line: str | None
+    lines: list[CachedLyricLine] | None
+    checked_at: float = 0
+
+
+@dataclass
+class LyricsCacheEntry:
+    versions: LyricVersions
+    empty_line: str | None
+    lines: list[NCMLrcGroupLine] | None
+    checked_at: float
+
+
+def get_lyric_versions(data: md.LyricData) -> LyricVersions:
+    return tuple(  # type: ignore
+        x.version if x else -1 for x in (data.lrc, data.trans_lrc, data.roma_lrc)
+    )
+
+
+def get_lyrics_check_interval() -> int:
+    return config.metadata_cache_ttl.get("lyrics")
+
+
+lyrics_cache: LRUCache[int, LyricsCacheEntry] = LRUCache(
+    max(config.lyrics_cache_size, 1),
+)
+lyrics_flight: SingleFlight[int, list[NCMLrcGroupLine] | None] = SingleFlight()
+
+
+def is_entry_usable(entry: LyricsCacheEntry) -> bool:
+    # normalized result depends on `lrc_empty_line`
+    return entry.empty_line == config.lrc_empty_line
+
+
+def is_entry_fresh(entry: LyricsCacheEntry) -> bool:
+    return time.time() - entry.checked_at < get_lyrics_check_interval()
+
+
+async def load_stored_lyrics(song_id: int) -> LyricsCacheEntry | None:
+    if not (stored := await metadata_store.get("lyrics", song_id, CachedLyrics)):
+        return None
+    return LyricsCacheEntry(
+        versions=tuple(stored.versions),  # type: ignore
+        empty_line=stored.empty_line,
+        lines=(
+            [LrcGroupLine(time=x.time, lrc=x.lrc) for x in stored.lines]  # type: ignore
+            if stored.lines is not None
+            else None
+        ),
+        checked_at=stored.checked_at,
+    )
+
+
+async def store_lyrics(song_id: int, entry: LyricsCacheEntry):
+    if config.lyrics_cache_size > 0:
+        lyrics_cache[song_id] = entry
+    await metadata_store.set(
+        "lyrics",
+        song_id,
+        CachedLyrics(
+            versions=list(entry.versions),
+            empty_line=entry.empty_line,
+            lines=(
+                [CachedLyricLine(time=x.time, lrc=x.lrc) for x in entry.lines]
+                if entry.lines is not None
+                else None
+            ),
+            checked_at=entry.checked_at,
+        ),
+    )
+
+
+async def _fetch_lyrics(song_id: int) -> list[NCMLrcGroupLine] | None:
+    entry = lyrics_cache.get(song_id)
+    if (not entry) or (not is_entry_usable(entry)):
+        entry = await load_stored_lyrics(song_id)
+        if entry and is_entry_usable(entry) and is_entry_fresh(entry):
+            if config.lyrics_cache_size > 0:
+                lyrics_cache[song_id] = entry
+            return entry.lines
+
+    data = await get_track_lrc(song_id)
+    versions = get_lyric_versions(data)
+    if entry and is_entry_usable(entry) and entry.versions == versions:
+        # lyrics not changed, skip normalizing
+        entry.checked_at = time.time()
+    else:
+        entry = LyricsCacheEntry(
+            versions=versions,
+            empty_line=config.lrc_empty_line,
+            lines=normalize_lrc(data),
+            checked_at=time.time(),
+        )
+    await store_lyrics(song_id, entry)
+    return entry.lines
+
+
+async def get_song_lyrics(song_id: int) -> list[NCMLrcGroupLine] | None:
+    if (
+        (entry := lyrics_cache.get(song_id))
+        and is_entry_usable(entry)
+        and is_entry_fresh(entry)
+    ):
+        return entry.lines
+    return await lyrics_flight.run(song_id, lambda: _fetch_lyrics(song_id))
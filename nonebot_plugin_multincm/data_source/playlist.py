@@ -1,8 +1,14 @@
+import asyncio
+from array import array
 from collections.abc import Iterable
 from contextlib import suppress
 from typing import Generic, TypeVar
 from typing_extensions import Self, override
 
+from cachetools import TTLCache
+from cookit.loguru import warning_suppress
+
+from ..config import config
 from ..utils import calc_min_max_index, cut_string, get_thumb_url
 from .base import (
     BasePlaylist,
@@ -19,6 +25,12 @@ from .song import Song, SongListPage
 
 _TSongList = TypeVar("_TSongList", bound=BaseSongList)
 
+# playlist id -> (playlist header without track ids, track ids)
+playlist_cache: TTLCache[int, tuple[md.Playlist, "array[int]"]] = TTLCache(
+    max(config.playlist_cache_size, 1),
+    config.metadata_cache_ttl.get("playlist"),
+)
+
 
 class PlaylistListPage(
     BaseSongListPage[md.BasePlaylist, _TSongList],
@@ -44,6 +56,20 @@ class Playlist(BasePlaylist[md.Playlist, list[md.Song], md.Song, Song]):
     child_calling = Song.calling
     link_types = ("playlist",)
 
+    @override
+    def __init__(
+        self,
+        info: md.Playlist,
+        track_ids: "array[int] | None" = None,
+    ) -> None:
+        super().__init__(info)
+        if track_ids is None:
+            track_ids = array("q", (x.id for x in info.track_ids))
+            # ids are kept compactly in `track_ids`, drop the model list
+            info.track_ids = []
+        self.track_ids: array[int] = track_ids
+        self._hydrate_tasks: dict[int, asyncio.Task[bool]] = {}
+
     @property
     @override
     def id(self) -> int:
@@ -52,8 +78,41 @@ class Playlist(BasePlaylist[md.Playlist, list[md.Song], md.Song, Song]):
     @classmethod
     @override
     async def from_id(cls, arg_id: int) -> Self:
+        if cached := playlist_cache.get(arg_id):
+            return cls(*cached)
         resp = await get_playlist_info(arg_id)
-        return cls(resp)
+        self = cls(resp)
+        if config.playlist_cache_size > 0:
+            playlist_cache[arg_id] = (self.info, self.track_ids)
+        return self
+
+    @property
+    def hydrate_chunk_size(self) -> int:
+        return max(config.playlist_hydrate_chunk_size, config.list_limit)
+
+    async def _hydrate_chunk(self, chunk: int) -> bool:
+        size = self.hydrate_chunk_size
+        ids = self.track_ids[chunk * size : (chunk + 1) * size]
+        with warning_suppress(f"Failed to hydrate chunk {chunk} of {self}"):
+            await get_track_info(ids.tolist())
+            return True
+        return False
+
+    def _on_hydrate_done(self, chunk: int, task: "asyncio.Task[bool]"):
+        # forget failed chunks so they will be retried next time
+        if (not task.cancelled()) and (not task.exception()) and task.result():
+            return
+        if self._hydrate_tasks.get(chunk) is task:
+            del self._hydrate_tasks[chunk]
+
+    def _schedule_hydrate(self, chunk: int):
+        if (chunk in self._hydrate_tasks) or (
+            chunk * self.hydrate_chunk_size >= len(self.track_ids)
+        ):
+            return
+        task = asyncio.create_task(self._hydrate_chunk(chunk))
+        self._hydrate_tasks[chunk] = task
+        task.add_done_callback(lambda t, c=chunk: self._on_hydrate_done(c, t))
 
     @override
     async def _extract_resp_content(self, resp: list[md.Song]) -> list[md.Song]:
@@ -66,8 +125,18 @@ class Playlist(BasePlaylist[md.Playlist, list[md.Song], md.Song, Song]):
     @override
     async def _do_get_page(self, page: int) -> list[md.Song]:
         min_index, max_index = calc_min_max_index(page)
-        track_ids = [x.id for x in self.info.track_ids[min_index:max_index]]
-        return await get_track_info(track_ids)
+        size = self.hydrate_chunk_size
+        chunks = range(min_index // size, (max_index - 1) // size + 1)
+        # wait for in-flight bulk fetches covering this page,
+        # then the songs will be served from track cache
+        if waiting := [t for c in chunks if (t := self._hydrate_tasks.get(c))]:
+            await asyncio.wait(waiting)
+
+        songs = await get_track_info(self.track_ids[min_index:max_index].tolist())
+        # bulk fetch the rest of current chunk and the next one in background
+        for chunk in (*chunks, chunks[-1] + 1):
+            self._schedule_hydrate(chunk)
+        return songs
 
     @override
     async def _build_selection(self, resp: md.Song) -> Song:
@@ -13,7 +13,7 @@ from .base import (
     searcher,
     song,
 )
-from .raw import get_program_info, get_track_audio, md, search_program
+from .raw import get_program_info, get_track_audio_batched, md, search_program
 
 _TSongList = TypeVar("_TSongList", bound=BaseSongList)
 
@@ -81,9 +81,7 @@ class Program(BaseSong[md.ProgramBaseInfo]):
 
     @override
     async def get_playable_url(self) -> str:
-        song_id = self.info.main_track_id
-        info = (await get_track_audio([song_id]))[0]
-        return info.url
+        return (await get_track_audio_batched(self.info.main_track_id)).url
 
     @override
     async def get_lyrics(self) -> None:
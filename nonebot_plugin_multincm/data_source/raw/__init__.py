@@ -1,5 +1,14 @@
 from . import models
-from .login import login as login
+from .batch import (
+    BatchItemMissingError as BatchItemMissingError,
+    BatchLoader as BatchLoader,
+    get_track_audio_batched as get_track_audio_batched,
+    get_track_info_batched as get_track_info_batched,
+)
+from .login import (
+    LoginManager as LoginManager,
+    login_manager as login_manager,
+)
 from .request import (
     get_album_info as get_album_info,
     get_playlist_info as get_playlist_info,
@@ -16,7 +25,18 @@ from .request import (
     search_program as search_program,
     search_radio as search_radio,
     search_song as search_song,
+    track_cache as track_cache,
+)
+from .session import (
+    SessionHolder as SessionHolder,
+    session_holder as session_holder,
+)
+from .store import (
+    MetadataStore as MetadataStore,
+    metadata_cached as metadata_cached,
+    metadata_store as metadata_store,
 )
+from .transport import transport as transport
 
 md = models
 del models
@@ -0,0 +1,123 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Generic, TypeVar
+
+from nonebot import logger
+
+from ...config import config
+from .models import Song, TrackAudio
+from .request import get_track_audio, get_track_info
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchItemMissingError(KeyError):
+    pass
+
+
+class BatchLoader(Generic[K, V]):
+    def __init__(
+        self,
+        name: str,
+        load_func: Callable[[list[K]], Awaitable[dict[K, V]]],
+        delay: float | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        self.name = name
+        self.load_func = load_func
+        self.delay = config.request_batch_delay if delay is None else delay
+        self.max_size = max_size or config.request_batch_size
+
+        self._pending: dict[K, asyncio.Future[V]] = {}
+        self._running: dict[K, asyncio.Future[V]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V:
+        fut = self._running.get(key) or self._pending.get(key)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            self._pending[key] = fut
+            if len(self._pending) >= self.max_size:
+                self.dispatch()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    self.delay,
+                    self.dispatch,
+                )
+        return await asyncio.shield(fut)
+
+    async def load_many(self, keys: Iterable[K]) -> list[V]:
+        return await asyncio.gather(*(self.load(x) for x in keys))
+
+    def dispatch(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        self._running.update(batch)
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, asyncio.Future[V]]) -> None:
+        logger.debug(f"{self.name}: dispatching batch of {len(batch)} keys")
+        try:
+            result = await self.load_func(list(batch))
+        except asyncio.CancelledError:
+            for fut in batch.values():
+                fut.cancel()
+            raise
+        except BaseException as e:
+            for fut in batch.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            for key, fut in batch.items():
+                if fut.done():
+                    continue
+                if key in result:
+                    fut.set_result(result[key])
+                else:
+                    fut.set_exception(BatchItemMissingError(key))
+        finally:
+            for key, fut in batch.items():
+                if self._running.get(key) is fut:
+                    del self._running[key]
+            # avoid "exception was never retrieved" when all waiters are gone
+            for fut in batch.values():
+                if fut.done() and not fut.cancelled():
+                    fut.exception()
+
+
+async def _load_track_audio(song_ids: list[int]) -> dict[int, TrackAudio]:
+    return {x.id: x for x in await get_track_audio(song_ids)}
+
+
+track_audio_loader: BatchLoader[int, TrackAudio] = BatchLoader(
+    "GetTrackAudio",
+    _load_track_audio,
+)
+
+
+async def get_track_audio_batched(song_id: int) -> TrackAudio:
+    return await track_audio_loader.load(song_id)
+
+
+async def _load_track_info(song_ids: list[int]) -> dict[int, Song]:
+    return {x.id: x for x in await get_track_info(song_ids)}
+
+
+track_info_loader: BatchLoader[int, Song] = BatchLoader(
+    "GetTrackDetail",
+    _load_track_info,
+)
+
+
+async def get_track_info_batched(song_id: int) -> Song:
+    return await track_info_loader.load(song_id)
@@ -1,5 +1,6 @@
 import asyncio
 import time
+from contextlib import suppress
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +10,7 @@ from cookit.loguru import warning_suppress
 from nonebot import logger
 from nonebot.utils import run_sync
 from pyncm import (
+    CreateNewSession,
     DumpSessionAsString,
     GetCurrentSession,
     LoadSessionFromString,
@@ -30,6 +32,11 @@ from pyncm.apis.login import (
 from ...config import config
 from ...const import SESSION_FILE_PATH
 from .request import NCMResponseError, ncm_request
+from .session import session_holder
+
+# login flows run on a fresh session set as pyncm's current session,
+# so requests inside them must pass `session=GetCurrentSession()` explicitly,
+# otherwise `ncm_request` will send them with the serving session
 
 
 async def cookie_login(music_u: str):
@@ -47,6 +54,7 @@ async def sms_login(phone: str, country_code: int = 86):
             SetSendRegisterVerifcationCodeViaCellphone,
             phone,
             country_code,
+            session=GetCurrentSession(),  # type: ignore
         )
         last_send_time = time.time()
         logger.success(
@@ -109,7 +117,11 @@ async def qrcode_login():
         while True:
             await asyncio.sleep(2)
             try:
-                await ncm_request(LoginQrcodeCheck, uni_key)
+                await ncm_request(
+                    LoginQrcodeCheck,
+                    uni_key,
+                    session=GetCurrentSession(),  # type: ignore
+                )
             except NCMResponseError as e:
                 code = e.code
                 if code != last_status:
@@ -126,7 +138,12 @@ async def qrcode_login():
                     raise
 
     while True:
-        uni_key: str = (await ncm_request(LoginQrcodeUnikey))["unikey"]
+        uni_key: str = (
+            await ncm_request(
+                LoginQrcodeUnikey,
+                session=GetCurrentSession(),  # type: ignore
+            )
+        )["unikey"]
 
         url = f"https://music.163.com/login?codekey={uni_key}"
         qr = qrcode.QRCode()
@@ -162,12 +179,15 @@ async def anonymous_login():
     await ncm_request(LoginViaAnonymousAccount)
 
 
-async def validate_login():
+async def validate_login(session: Any) -> bool:
     with warning_suppress("Failed to get login status"):
-        ret = await ncm_request(GetCurrentLoginStatus)
+        ret = await ncm_request(
+            GetCurrentLoginStatus,
+            session=session,  # type: ignore
+        )
         ok = bool(ret.get("account"))
         if ok:
-            WriteLoginInfo(ret)
+            WriteLoginInfo(ret, session)
         return ok
     return False
 
@@ -177,19 +197,6 @@ async def do_login(anonymous: bool = False):
         logger.info("使用游客身份登录")
         await anonymous_login()
 
-    elif SESSION_FILE_PATH.exists():
-        logger.info(f"使用缓存登录态 ({SESSION_FILE_PATH})")
-        SetCurrentSession(
-            LoadSessionFromString(
-                (await anyio.Path(SESSION_FILE_PATH).read_text(encoding="u8")),
-            ),
-        )
-        if not (await validate_login()):
-            SESSION_FILE_PATH.unlink()
-            logger.warning("恢复缓存会话失败，尝试使用正常流程登录")
-            await do_login()
-            return
-
     elif config.cookie_music_u:
         logger.info("使用 Cookie 登录")
         await cookie_login(config.cookie_music_u)
@@ -222,28 +229,94 @@ async def do_login(anonymous: bool = False):
         logger.info("使用二维码登录")
         await qrcode_login()
 
-    if anonymous:
-        logger.success("游客登录成功")
-    else:
-        session = GetCurrentSession()
-        SESSION_FILE_PATH.write_text(DumpSessionAsString(session), "u8")
-        logger.success(f"登录成功，欢迎您，{session.nickname} [{session.uid}]")
 
+class LoginManager:
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def session(self) -> Any:
+        return session_holder.session
+
+    @staticmethod
+    def load_cached_session() -> Any | None:
+        if not SESSION_FILE_PATH.exists():
+            return None
+        with warning_suppress(f"Failed to load cached session {SESSION_FILE_PATH}"):
+            return LoadSessionFromString(SESSION_FILE_PATH.read_text(encoding="u8"))
+        return None
+
+    @staticmethod
+    async def save_session(session: Any) -> None:
+        with warning_suppress("Failed to save session"):
+            await anyio.Path(SESSION_FILE_PATH).write_text(
+                DumpSessionAsString(session),
+                encoding="u8",
+            )
 
-async def login():
-    # if "nonebot-plugin-ncm" in get_available_plugin_names():
-    #     logger.info("nonebot-plugin-ncm 已安装，本插件将依赖其全局 Session")
-    #     require("nonebot-plugin-ncm")
-    #     return
+    async def run_flow(self, anonymous: bool = False) -> None:
+        # run the flow on a fresh session, serving session is untouched
+        # until the flow succeeded, then swap the new one in
+        async with self._lock:
+            session = CreateNewSession()
+            SetCurrentSession(session)
+            try:
+                await do_login(anonymous)
+            except BaseException:
+                SetCurrentSession(self.session)
+                raise
+            session_holder.swap(session)
+
+        if anonymous:
+            logger.success("游客登录成功")
+        else:
+            await self.save_session(session)
+            logger.success(f"登录成功，欢迎您，{session.nickname} [{session.uid}]")
+
+    async def login(self) -> None:
+        if not config.anonymous:
+            with warning_suppress("登录失败，回落到游客登录"):
+                await self.run_flow()
+                return
 
-    if GetCurrentSession().logged_in:
-        logger.info("检测到当前全局 Session 已登录，插件将跳过登录步骤")
-        return
+        with warning_suppress("登录失败"):
+            await self.run_flow(anonymous=True)
 
-    if not config.anonymous:
-        with warning_suppress("登录失败，回落到游客登录"):
-            await do_login()
+    async def validate_cached(self, session: Any) -> None:
+        if await validate_login(session):
+            await self.save_session(session)
+            logger.success(f"缓存登录态有效，欢迎您，{session.nickname} [{session.uid}]")
             return
+        with warning_suppress("Failed to delete invalid cached session"):
+            SESSION_FILE_PATH.unlink(missing_ok=True)
+        logger.warning("恢复缓存会话失败，尝试使用正常流程登录")
+        await self.login()
+
+    def start(self) -> None:
+        # if "nonebot-plugin-ncm" in get_available_plugin_names():
+        #     logger.info("nonebot-plugin-ncm 已安装，本插件将依赖其全局 Session")
+        #     require("nonebot-plugin-ncm")
+        #     return
+
+        if self.session.logged_in:
+            logger.info("检测到当前全局 Session 已登录，插件将跳过登录步骤")
+            return
+
+        # serve requests with cached session right away, validate it in background
+        if (not config.anonymous) and (session := self.load_cached_session()):
+            logger.info(f"使用缓存登录态 ({SESSION_FILE_PATH})")
+            session_holder.swap(session)
+            self._task = asyncio.create_task(self.validate_cached(session))
+        else:
+            self._task = asyncio.create_task(self.login())
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+
 
-    with warning_suppress("登录失败"):
-        await do_login(anonymous=True)
+login_manager = LoginManager()
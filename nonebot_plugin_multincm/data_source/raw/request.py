@@ -3,7 +3,7 @@ from functools import partial
 from typing import Any, TypeVar, cast, overload
 from typing_extensions import ParamSpec
 
-from nonebot.utils import run_sync
+from cachetools import TTLCache
 from pydantic import BaseModel
 from pyncm.apis import EapiCryptoRequest, WeapiCryptoRequest, cloudsearch as search
 from pyncm.apis.album import GetAlbumInfo
@@ -29,10 +29,19 @@ from .models import (
     SongSearchResult,
     TrackAudio,
 )
+from .session import session_holder
+from .store import metadata_cached, metadata_store
+from .transport import is_crypto_request, transport
 
 TModel = TypeVar("TModel", bound=BaseModel)
 P = ParamSpec("P")
 
+# in memory tier before metadata store, shared by everything hydrating songs
+track_cache: TTLCache[int, Song] = TTLCache(
+    max(config.track_cache_size, 1),
+    config.metadata_cache_ttl.get("song"),
+)
+
 
 class NCMResponseError(Exception):
     def __init__(self, name: str, data: dict[str, Any]):
@@ -56,7 +65,9 @@ async def ncm_request(
     *args: P.args,
     **kwargs: P.kwargs,
 ) -> dict[str, Any]:
-    ret = await run_sync(api)(*args, **kwargs)
+    if is_crypto_request(api) and ("session" not in kwargs):
+        kwargs["session"] = session_holder.session
+    ret = await transport.request(api, *args, **kwargs)
     if debug.enabled:
         debug.write(ret, f"{api.__name__}_{{time}}.json")
     if ret.get("code", 200) != 200:
@@ -171,19 +182,31 @@ async def get_track_audio(
 
 
 async def get_track_info(ids: list[int], **kwargs) -> list[Song]:
-    res = await ncm_request(GetTrackDetail, ids, **kwargs)
-    privileges = {y.id: y for y in [Privilege(**x) for x in res["privileges"]]}
-    return [
-        Song(
-            **x,
-            privilege=(
-                privileges[song_id]
-                if (song_id := x["id"]) in privileges
-                else Privilege(id=song_id, pl=128000)  # , plLevel="standard")
-            ),
-        )
-        for x in res["songs"]
-    ]
+    loaded = {x: it for x in ids if (it := track_cache.get(x))}
+    if missing := [x for x in ids if x not in loaded]:
+        stored = await metadata_store.get_many("song", missing, Song)
+        loaded.update({int(k): v for k, v in stored.items()})
+        track_cache.update({int(k): v for k, v in stored.items()})
+
+    if missing := [x for x in ids if x not in loaded]:
+        res = await ncm_request(GetTrackDetail, missing, **kwargs)
+        privileges = {y.id: y for y in [Privilege(**x) for x in res["privileges"]]}
+        fetched = {
+            song_id: Song(
+                **x,
+                privilege=(
+                    privileges[song_id]
+                    if (song_id := x["id"]) in privileges
+                    else Privilege(id=song_id, pl=128000)  # , plLevel="standard")
+                ),
+            )
+            for x in res["songs"]
+        }
+        await metadata_store.set_many("song", {str(k): v for k, v in fetched.items()})
+        track_cache.update(fetched)
+        loaded.update(fetched)
+
+    return [it for x in ids if (it := loaded.get(x))]
 
 
 async def get_track_lrc(song_id: int):
@@ -191,7 +214,8 @@ async def get_track_lrc(song_id: int):
     return LyricData(**res)
 
 
-async def get_radio_info(radio_id: int):
+@metadata_cached("radio", Radio)
+async def get_radio_info(radio_id: int) -> Radio:
     @WeapiCryptoRequest  # type: ignore
     def GetRadioInfo():  # noqa: N802
         return ("/api/djradio/v2/get", {"id": radio_id})
@@ -213,7 +237,8 @@ async def get_radio_programs(radio_id: int, page: int = 1):
     return RadioProgramList(**res)
 
 
-async def get_program_info(program_id: int):
+@metadata_cached("program", ProgramBaseInfo)
+async def get_program_info(program_id: int) -> ProgramBaseInfo:
     @WeapiCryptoRequest  # type: ignore
     def GetProgramDetail():  # noqa: N802
         return ("/api/dj/program/detail", {"id": program_id})
@@ -222,11 +247,13 @@ async def get_program_info(program_id: int):
     return ProgramBaseInfo(**res["program"])
 
 
-async def get_playlist_info(playlist_id: int):
+@metadata_cached("playlist", Playlist)
+async def get_playlist_info(playlist_id: int) -> Playlist:
     res = await ncm_request(GetPlaylistInfo, playlist_id)
     return Playlist(**res["playlist"])
 
 
-async def get_album_info(album_id: int):
+@metadata_cached("album", AlbumInfo)
+async def get_album_info(album_id: int) -> AlbumInfo:
     res = await ncm_request(GetAlbumInfo, str(album_id))
     return AlbumInfo(**res)
@@ -0,0 +1,21 @@
+from typing import Any
+
+from pyncm import GetCurrentSession, SetCurrentSession
+
+
+class SessionHolder:
+    def __init__(self) -> None:
+        self._session: Any = GetCurrentSession()
+
+    @property
+    def session(self) -> Any:
+        return self._session
+
+    def swap(self, session: Any) -> None:
+        # requests take the session once when they start,
+        # so in-flight ones keep using the old session
+        self._session = session
+        SetCurrentSession(session)
+
+
+session_holder = SessionHolder()
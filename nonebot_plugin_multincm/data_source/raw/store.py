@@ -0,0 +1,144 @@
+import json
+import sqlite3
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from functools import wraps
+from pathlib import Path
+from threading import RLock
+from typing import Any, TypeVar
+
+from cookit.loguru import warning_suppress
+from nonebot.compat import model_dump, type_validate_python
+from nonebot.utils import run_sync
+from pydantic import BaseModel
+
+from ...config import config
+from ...const import METADATA_DB_PATH
+
+TModel = TypeVar("TModel", bound=BaseModel)
+
+
+class MetadataStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if not self._conn:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "kind TEXT NOT NULL, "
+                "id TEXT NOT NULL, "
+                "data TEXT NOT NULL, "
+                "updated_at REAL NOT NULL, "
+                "PRIMARY KEY (kind, id))",
+            )
+            self._conn = conn
+            self._purge_expired()
+        return self._conn
+
+    @staticmethod
+    def get_ttl(kind: str) -> int:
+        if not config.metadata_cache:
+            return 0
+        return config.metadata_cache_ttl.get(kind)
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        with self._lock, self.conn:
+            for kind in config.metadata_cache_ttl.kinds():
+                self.conn.execute(
+                    "DELETE FROM metadata WHERE kind = ? AND updated_at < ?",
+                    (kind, now - config.metadata_cache_ttl.get(kind)),
+                )
+
+    def _get_many(self, kind: str, ids: list[str]) -> dict[str, Any]:
+        min_time = time.time() - self.get_ttl(kind)
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, data FROM metadata "
+                f"WHERE kind = ? AND updated_at >= ? AND id IN ({placeholders})",
+                (kind, min_time, *ids),
+            ).fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def _set_many(self, kind: str, items: dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO metadata (kind, id, data, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (kind, k, json.dumps(v, ensure_ascii=False), now)
+                    for k, v in items.items()
+                ],
+            )
+
+    async def get_many(
+        self,
+        kind: str,
+        ids: Iterable[int | str],
+        model: type[TModel],
+    ) -> dict[str, TModel]:
+        ids = [str(x) for x in ids]
+        if (not ids) or (not self.get_ttl(kind)):
+            return {}
+        with warning_suppress(f"Failed to read {kind} metadata cache"):
+            data = await run_sync(self._get_many)(kind, ids)
+            return {k: type_validate_python(model, v) for k, v in data.items()}
+        return {}
+
+    async def get(
+        self,
+        kind: str,
+        item_id: int | str,
+        model: type[TModel],
+    ) -> TModel | None:
+        return (await self.get_many(kind, [item_id], model)).get(str(item_id))
+
+    async def set_many(
+        self,
+        kind: str,
+        items: Mapping[int, BaseModel] | Mapping[str, BaseModel],
+    ) -> None:
+        if (not items) or (not self.get_ttl(kind)):
+            return
+        with warning_suppress(f"Failed to write {kind} metadata cache"):
+            await run_sync(self._set_many)(
+                kind,
+                {str(k): model_dump(v, by_alias=True) for k, v in items.items()},
+            )
+
+    async def set(self, kind: str, item_id: int | str, item: BaseModel) -> None:
+        await self.set_many(kind, {str(item_id): item})
+
+    def close(self) -> None:
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+
+metadata_store = MetadataStore(METADATA_DB_PATH)
+
+
+def metadata_cached(kind: str, model: type[TModel]):
+    def deco(
+        func: Callable[[int], Awaitable[TModel]],
+    ) -> Callable[[int], Awaitable[TModel]]:
+        @wraps(func)
+        async def wrapper(item_id: int) -> TModel:
+            if (it := await metadata_store.get(kind, item_id, model)) is not None:
+                return it
+            it = await func(item_id)
+            await metadata_store.set(kind, item_id, it)
+            return it
+
+        return wrapper
+
+    return deco
@@ -0,0 +1,151 @@
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from contextlib import suppress
+from typing import Any
+
+from httpx import AsyncClient
+from nonebot.utils import run_sync
+from pyncm import GetCurrentSession
+
+from ...config import config
+from ...utils import http_clients
+
+
+class RequestCaptured(Exception):  # noqa: N818
+    def __init__(self, method: str, url: str, kwargs: dict[str, Any]):
+        self.method = method
+        self.url = url
+        self.kwargs = kwargs
+
+
+# proxy of pyncm session, let pyncm build the encrypted request without sending it
+class CaptureSession:
+    def __init__(self, session: Any):
+        self.__session = session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__session, name)
+
+    def request(self, method: str, url: str, *_, **kwargs: Any):
+        raise RequestCaptured(method, url, kwargs)
+
+
+def is_crypto_request(api: Callable[..., Any]) -> bool:
+    # functions wrapped by pyncm's `WeapiCryptoRequest` / `EapiCryptoRequest`
+    # are made by `functools.wraps`, plain functions (e.g. login flows) are not
+    return hasattr(api, "__wrapped__")
+
+
+class BaseTransport(ABC):
+    @abstractmethod
+    async def request(
+        self,
+        api: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> dict[str, Any]: ...
+
+    async def aclose(self) -> None:  # noqa: B027
+        pass
+
+
+class PyncmTransport(BaseTransport):
+    async def request(
+        self,
+        api: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        return await run_sync(api)(*args, **kwargs)
+
+
+class HttpxTransport(PyncmTransport):
+    @property
+    def client(self) -> AsyncClient:
+        return http_clients.get("ncm")
+
+    @staticmethod
+    def capture(
+        api: Callable[..., Any],
+        session: Any,
+        *args: Any,
+        **kwargs: Any,
+    ) -> RequestCaptured:
+        try:
+            api(*args, session=CaptureSession(session), **kwargs)
+        except RequestCaptured as e:
+            return e
+        raise RuntimeError(f"API {api.__name__} did not send any request")
+
+    @staticmethod
+    def build_headers(session: Any, captured: RequestCaptured) -> dict[str, str]:
+        headers = {
+            **session.headers,
+            **(captured.kwargs.get("headers") or {}),
+        }
+        cookies = {
+            **session.cookies.get_dict(),
+            **(captured.kwargs.get("cookies") or {}),
+        }
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in cookies.items())
+        return {k: v for k, v in headers.items() if v is not None}
+
+    @staticmethod
+    def build_url(session: Any, url: str) -> str:
+        if not url.startswith("http"):
+            url = f"https://{getattr(session, 'HOST', 'music.163.com')}{url}"
+        if getattr(session, "force_http", False):
+            url = url.replace("https:", "http:")
+        return url
+
+    @staticmethod
+    def parse_response(url: str, content: bytes) -> dict[str, Any]:
+        if "/eapi/" in url:
+            from pyncm.utils.crypto import EapiDecrypt
+
+            with suppress(Exception):
+                content = EapiDecrypt(content)
+        text = content.decode() if isinstance(content, bytes) else content
+        return json.loads(text.strip("\x10"))
+
+    async def request(
+        self,
+        api: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        if not is_crypto_request(api):
+            return await super().request(api, *args, **kwargs)
+
+        session = kwargs.pop("session", None) or GetCurrentSession()
+        captured = self.capture(api, session, *args, **kwargs)
+        url = self.build_url(session, captured.url)
+        headers = self.build_headers(session, captured)
+        request = self.client.build_request(
+            captured.method,
+            url,
+            params=captured.kwargs.get("params"),
+            data=captured.kwargs.get("data"),
+            headers=headers,
+        )
+        # the shared client jar may hold cookies of another session,
+        # only send the ones of the session this request belongs to
+        request.headers.pop("Cookie", None)
+        if "Cookie" in headers:
+            request.headers["Cookie"] = headers["Cookie"]
+        resp = await self.client.send(request)
+        # pyncm session is the single source of truth of cookies,
+        # keep domain and path so they won't conflict with the restored ones
+        if resp.cookies:
+            session.cookies.update(resp.cookies.jar)
+            self.client.cookies.clear()
+        return self.parse_response(url, resp.content)
+
+
+registered_transport: dict[str, type[BaseTransport]] = {
+    "pyncm": PyncmTransport,
+    "httpx": HttpxTransport,
+}
+transport: BaseTransport = registered_transport[config.transport]()
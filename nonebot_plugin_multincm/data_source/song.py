@@ -8,7 +8,6 @@ from ..utils import (
     format_time,
     get_thumb_url,
     merge_alias,
-    normalize_lrc,
 )
 from .base import (
     BaseSearcher,
@@ -19,7 +18,14 @@ from .base import (
     searcher,
     song,
 )
-from .raw import get_track_audio, get_track_info, get_track_lrc, md, search_song
+from .lyrics import get_song_lyrics
+from .raw import (
+    BatchItemMissingError,
+    get_track_audio_batched,
+    get_track_info_batched,
+    md,
+    search_song,
+)
 
 _TSongList = TypeVar("_TSongList", bound=BaseSongList)
 
@@ -50,9 +56,10 @@ class Song(BaseSong[md.Song]):
     @classmethod
     @override
     async def from_id(cls, arg_id: int) -> Self:
-        info = (await get_track_info([arg_id]))[0]
-        if not info:
-            raise ValueError("Song not found")
+        try:
+            info = await get_track_info_batched(arg_id)
+        except BatchItemMissingError as e:
+            raise ValueError("Song not found") from e
         return cls(info)
 
     @override
@@ -77,12 +84,11 @@ class Song(BaseSong[md.Song]):
 
     @override
     async def get_playable_url(self) -> str:
-        info = (await get_track_audio([self.info.id]))[0]
-        return info.url
+        return (await get_track_audio_batched(self.info.id)).url
 
     @override
     async def get_lyrics(self) -> list[NCMLrcGroupLine] | None:
-        return normalize_lrc(await get_track_lrc(self.info.id))
+        return await get_song_lyrics(self.info.id)
 
 
 @searcher
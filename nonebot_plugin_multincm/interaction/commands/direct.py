@@ -11,7 +11,7 @@ async def _(matcher: Matcher, song: ResolvedSong):
     if not song:
         await matcher.finish("未能从您的消息中解析到有效歌曲信息")
     try:
-        url = await song.get_playable_url()
+        url = (await song.get_info()).playable_url
     except Exception:
         logger.exception(f"Failed to get playable url for {song}")
         await matcher.finish("获取直链失败，请检查后台输出")
@@ -1,30 +1,95 @@
+import asyncio
+import time
+from collections.abc import Awaitable
+from typing import TypeVar
+
+from cookit.loguru import warning_suppress
 from nonebot import logger, on_command
 from nonebot.matcher import Matcher
 from nonebot_plugin_alconna.uniseg import UniMessage
 
-from ...render import render_lyrics
+from ...data_source import GeneralSong
+from ...render import (
+    LyricsHeaderRenderParams,
+    fetch_cover,
+    prepare_template_page,
+    render_lyrics,
+)
+from ...utils import format_alias, get_thumb_url
 from ..resolver import ResolvedSong
 
+T = TypeVar("T")
+
 matcher_lyric = on_command("歌词", aliases={"lrc", "lyric", "lyrics"})
 
 
+class StageTimer:
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.stages: dict[str, float] = {}
+
+    async def run(self, stage: str, coro: Awaitable[T]) -> T:
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.stages[stage] = time.perf_counter() - start
+
+    def __str__(self) -> str:
+        total = time.perf_counter() - self.start
+        return " | ".join(
+            f"{k} {v * 1000:.0f}ms" for k, v in {**self.stages, "total": total}.items()
+        )
+
+
+async def get_lyrics_header(song: GeneralSong) -> LyricsHeaderRenderParams | None:
+    with warning_suppress(f"Failed to get lyrics header info for {song}"):
+        name, alias, artists, cover_url = await asyncio.gather(
+            song.get_name(),
+            song.get_alias(),
+            song.get_artists(),
+            song.get_cover_url(),
+        )
+        cover = get_thumb_url(cover_url)
+        # warm up cover cache, render will read it from there
+        with warning_suppress(f"Failed to fetch cover for {song}"):
+            await fetch_cover(cover)
+        return {
+            "cover": cover,
+            "title": format_alias(name, alias),
+            "artists": "、".join(artists),
+        }
+    return None
+
+
 @matcher_lyric.handle()
 async def _(matcher: Matcher, song: ResolvedSong):
     if not song:
         await matcher.finish("未能从您的消息中解析到有效歌曲信息")
 
+    timer = StageTimer()
+    lrc_task = asyncio.create_task(timer.run("lyrics", song.get_lyrics()))
+    header_task = asyncio.create_task(timer.run("header", get_lyrics_header(song)))
+    page_task = asyncio.create_task(
+        timer.run("page", prepare_template_page("lyrics.html.jinja")),
+    )
+
     try:
-        lrc = await song.get_lyrics()
+        lrc = await lrc_task
     except Exception:
+        header_task.cancel()
         logger.exception(f"Failed to get lyric for {song}")
         await matcher.finish("获取歌词失败，请检查后台输出")
 
     if not lrc:
+        header_task.cancel()
         await matcher.finish("该歌曲没有歌词")
 
+    header, _ = await asyncio.gather(header_task, page_task)
     try:
-        img = await render_lyrics(groups=lrc)
+        img = await timer.run("render", render_lyrics(groups=lrc, header=header))
     except Exception:
         logger.exception(f"Failed to render lyrics for {song}")
         await matcher.finish("渲染歌词失败，请检查后台输出")
+    logger.debug(f"Lyrics of {song} timings: {timer}")
     await UniMessage.image(raw=img).finish()
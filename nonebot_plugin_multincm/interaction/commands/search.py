@@ -24,7 +24,7 @@ from ...data_source import (
     GeneralSongOrList,
     registered_searcher,
 )
-from ...render import render_list_resp
+from ...render import render_cache, render_list_resp
 from ..message import construct_info_msg, send_song
 
 KEY_SEARCHER = "searcher"
@@ -47,6 +47,7 @@ async def handle_song_or_list(
         matcher = current_matcher.get()
 
     recall = RecallContext(delay=config.delete_msg_delay)
+    prefetching: list[GeneralSongList] = []
 
     async def handle(result: GeneralSongOrList) -> GeneralSongList:
         if isinstance(result, BaseSong):
@@ -64,6 +65,12 @@ async def handle_song_or_list(
             logger.exception(f"Failed to render page image for {result}")
             await matcher.finish("图片渲染失败，请检查后台输出")
 
+        # fetch neighbour pages while user is picking, also render them ahead
+        # when the rendered image will be cached, or the render is thrown away
+        song_list.prefetch(render_list_resp if render_cache.enabled else None)
+        if not any(x is song_list for x in prefetching):
+            prefetching.append(song_list)
+
         illegal_counter = 0
 
         async def tip_illegal(message: str):
@@ -166,6 +173,8 @@ async def handle_song_or_list(
     try:
         await main()
     finally:
+        for x in prefetching:
+            x.cancel_prefetch()
         if config.delete_msg:
             asyncio.create_task(recall.recall())
 
@@ -1,7 +1,6 @@
 from typing import TYPE_CHECKING
 
 from cookit.loguru import warning_suppress
-from httpx import AsyncClient
 from nonebot_plugin_alconna.builtins.uniseg.music_share import (
     MusicShare,
     MusicShareKind,
@@ -9,6 +8,7 @@ from nonebot_plugin_alconna.builtins.uniseg.music_share import (
 from nonebot_plugin_alconna.uniseg import UniMessage
 
 from ...config import config
+from ...utils import http_clients
 
 if TYPE_CHECKING:
     from ...data_source import BaseSong, SongInfo
@@ -16,19 +16,16 @@ if TYPE_CHECKING:
 
 async def sign_music_card(info: "SongInfo") -> str:
     assert config.card_sign_url
-    async with AsyncClient(
-        follow_redirects=True,
-        timeout=config.card_sign_timeout,
-    ) as cli:
-        body = {
-            "type": "custom",
-            "url": info.url,
-            "audio": info.playable_url,
-            "title": info.display_name,
-            "image": info.cover_url,
-            "singer": info.display_artists,
-        }
-        return (await cli.post(config.card_sign_url, json=body)).raise_for_status().text
+    body = {
+        "type": "custom",
+        "url": info.url,
+        "audio": info.playable_url,
+        "title": info.display_name,
+        "image": info.cover_url,
+        "singer": info.display_artists,
+    }
+    cli = http_clients.get("sign")
+    return (await cli.post(config.card_sign_url, json=body)).raise_for_status().text
 
 
 async def send_song_card_msg(song: "BaseSong"):
@@ -1,8 +1,8 @@
 import mimetypes
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, cast
 
 from cookit.loguru import log_exception_warning, warning_suppress
-from httpx import AsyncClient
 from nonebot import logger
 from nonebot.exception import NetworkError
 from nonebot.matcher import current_bot, current_event
@@ -10,7 +10,14 @@ from nonebot_plugin_alconna.uniseg import Receipt, UniMessage
 
 from ...config import config
 from ...const import SONG_CACHE_DIR
-from ...utils import encode_silk, ffmpeg_exists
+from ...utils import (
+    SingleFlight,
+    ffmpeg_exists,
+    ffmpeg_prober,
+    http_clients,
+    touch_cache_file,
+    transcode_silk,
+)
 
 if TYPE_CHECKING:
     from ...data_source import BaseSong, GeneralSongInfo
@@ -19,28 +26,41 @@ if TYPE_CHECKING:
 async def ensure_ffmpeg():
     if await ffmpeg_exists():
         return
-    logger.warning(
-        "FFmpeg 无法使用，插件将不会把音乐文件转为 silk 格式提交给协议端",
-    )
     raise TypeError("FFmpeg unavailable, fallback to UniMessage")
 
 
+download_flight: SingleFlight[Path, Path] = SingleFlight()
+
+
 def get_download_path(info: "GeneralSongInfo"):
     return SONG_CACHE_DIR / info.download_filename
 
 
+async def _download_song(info: "GeneralSongInfo", file_path: Path) -> Path:
+    # write to a temp file first so an interrupted download never looks like a hit
+    tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+    try:
+        cli = http_clients.get("download")
+        async with cli.stream("GET", info.playable_url) as resp:
+            resp.raise_for_status()
+            SONG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("wb") as f:
+                async for chunk in resp.aiter_bytes():
+                    f.write(chunk)
+        tmp_path.replace(file_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return file_path
+
+
 async def download_song(info: "GeneralSongInfo"):
     file_path = get_download_path(info)
-    if file_path.exists():
+    if touch_cache_file(file_path):
         return file_path
-
-    async with AsyncClient(follow_redirects=True) as cli, cli.stream("GET", info.playable_url) as resp:  # fmt: skip
-        resp.raise_for_status()
-        SONG_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        with file_path.open("wb") as f:
-            async for chunk in resp.aiter_bytes():
-                f.write(chunk)
-    return file_path
+    return await download_flight.run(
+        file_path,
+        lambda: _download_song(info, file_path),
+    )
 
 
 async def send_song_media_uni_msg(
@@ -58,9 +78,12 @@ async def send_song_media_uni_msg(
 
 async def send_song_voice_silk_uni_msg(info: "GeneralSongInfo"):
     await ensure_ffmpeg()
-    return await UniMessage.voice(
-        raw=(await encode_silk(get_download_path(info))).read_bytes(),
-    ).send()
+    try:
+        silk_path = await transcode_silk(get_download_path(info))
+    except Exception:
+        ffmpeg_prober.invalidate()  # re-probe next time in case ffmpeg is gone
+        raise
+    return await UniMessage.voice(raw=silk_path.read_bytes()).send()
 
 
 async def send_song_media_telegram(info: "GeneralSongInfo", as_file: bool = False):  # noqa: ARG001
@@ -6,7 +6,6 @@ from cachetools import TTLCache
 from cookit import flatten, queued
 from cookit.loguru import warning_suppress
 from cookit.nonebot.alconna import extract_reply_msg
-from httpx import AsyncClient
 from nonebot.adapters import Bot as BaseBot
 from nonebot.consts import REGEX_MATCHED
 from nonebot.params import Depends
@@ -24,7 +23,7 @@ from ..data_source import (
     registered_song,
     resolve_from_link_params,
 )
-from ..utils import is_song_card_supported
+from ..utils import http_clients, is_song_card_supported
 from .cache import get_cache
 
 ExpectedTypeType: TypeAlias = (
@@ -87,17 +86,19 @@ async def resolve_short_url(
     expected_type: ExpectedTypeType | None = None,
     use_cool_down: bool = False,
 ) -> GeneralSongOrPlaylist:
-    async with AsyncClient(base_url=SHORT_URL_BASE) as client:
-        resp = await client.get(suffix, follow_redirects=False)
+    resp = await http_clients.get("resolve").get(
+        f"{SHORT_URL_BASE}/{suffix}",
+        follow_redirects=False,
+    )
 
-        if resp.status_code // 100 != 3:
-            raise ValueError(
-                f"Short url {suffix} returned invalid status code {resp.status_code}",
-            )
+    if resp.status_code // 100 != 3:
+        raise ValueError(
+            f"Short url {suffix} returned invalid status code {resp.status_code}",
+        )
 
-        location = resp.headers.get("Location")
-        if not location:
-            raise ValueError(f"Short url {suffix} returned no location header")
+    location = resp.headers.get("Location")
+    if not location:
+        raise ValueError(f"Short url {suffix} returned no location header")
 
     matched = re.search(URL_REGEX, location, re.IGNORECASE)
     if not matched:
@@ -5,6 +5,28 @@ from .card_list import (
     render_list_resp as render_list_resp,
     render_track_card_html as render_track_card_html,
 )
+from .cover import (
+    cover_file_cache as cover_file_cache,
+    fetch_cover as fetch_cover,
+    get_cover_data_uri as get_cover_data_uri,
+    inline_covers as inline_covers,
+)
+from .image_cache import (
+    RenderedImageCache as RenderedImageCache,
+    render_cache as render_cache,
+)
 from .lyrics import (
+    LyricsHeaderRenderParams as LyricsHeaderRenderParams,
     render_lyrics as render_lyrics,
 )
+from .page_pool import (
+    PagePool as PagePool,
+    page_pool as page_pool,
+)
+from .utils import (
+    cached_render as cached_render,
+    prepare_template_page as prepare_template_page,
+    render_template_image as render_template_image,
+    render_template_image_uncached as render_template_image_uncached,
+    warmup_page_pool as warmup_page_pool,
+)
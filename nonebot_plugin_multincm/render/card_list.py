@@ -1,22 +1,15 @@
-import asyncio
 from typing import TYPE_CHECKING, TypedDict
 from typing_extensions import Unpack
 
+from ..config import config
 from ..utils import calc_min_index
-from .utils import render_html, render_template
+from .cover import inline_covers
+from .utils import cached_render, render_template, render_template_image_uncached
 
 if TYPE_CHECKING:
     from ..data_source import GeneralSongListPage
 
 
-class CardListRenderParams(TypedDict):
-    title: str
-    cards: list[str]
-    current_page: int
-    max_page: int
-    total_count: int
-
-
 class TrackCardRenderParams(TypedDict):
     index: int
     cover: str
@@ -26,25 +19,52 @@ class TrackCardRenderParams(TypedDict):
     small_extras: list[str]
 
 
+class CardListRenderParams(TypedDict):
+    title: str
+    cards: list[TrackCardRenderParams]
+    current_page: int
+    max_page: int
+    total_count: int
+
+
 async def render_card_list(**kwargs: Unpack[CardListRenderParams]) -> bytes:
-    return await render_html(await render_template("card_list.html.jinja", **kwargs))
+    name = "card_list.html.jinja"
+
+    async def render() -> bytes:
+        if config.render_backend == "pillow":
+            from .pillow_backend import render_card_list as render_card_list_pillow
+
+            return await render_card_list_pillow(**kwargs)
+
+        params = kwargs
+        if config.list_cover_inline:
+            cards = kwargs["cards"]
+            covers = await inline_covers([x["cover"] for x in cards])
+            params = {
+                **kwargs,
+                "cards": [{**x, "cover": c} for x, c in zip(cards, covers)],
+            }
+        return await render_template_image_uncached(name, **params)
+
+    # key on cover urls, covers are only fetched and inlined on a cache miss
+    return await cached_render(name, dict(kwargs), render)
 
 
 async def render_track_card_html(**kwargs: Unpack[TrackCardRenderParams]) -> str:
-    return await render_template("track_card.html.jinja", **kwargs)
+    return await render_template("track_card.html.jinja", card=kwargs)
 
 
 async def render_list_resp(resp: "GeneralSongListPage") -> bytes:
-    index_offset = calc_min_index(resp.father.current_page)
-    card_params = [
-        {"index": i, **x.__dict__}
-        for i, x in enumerate(await resp.transform_to_list_cards(), index_offset + 1)
-    ]
-    cards = await asyncio.gather(*(render_track_card_html(**x) for x in card_params))
+    page = resp.page or resp.father.current_page
+    index_offset = calc_min_index(page)
+    list_cards = await resp.transform_to_list_cards()
     return await render_card_list(
         title=f"{resp.father.child_calling}列表",
-        cards=cards,
-        current_page=resp.father.current_page,
+        cards=[
+            {"index": i, **x.__dict__}  # type: ignore
+            for i, x in enumerate(list_cards, index_offset + 1)
+        ],
+        current_page=page,
         max_page=resp.father.max_page,
         total_count=resp.father.total_count,
     )
@@ -0,0 +1,78 @@
+import asyncio
+import base64
+import hashlib
+from pathlib import Path
+from urllib.parse import quote
+
+import anyio
+from cookit.loguru import log_exception_warning, warning_suppress
+
+from ..config import config
+from ..const import COVER_CACHE_DIR
+from ..utils import FileCacheManager, SingleFlight, http_clients, touch_cache_file
+
+COVER_CACHE_MAX_AGE = 604800
+
+PLACEHOLDER_COVER = "data:image/svg+xml," + quote(
+    "<svg xmlns='http://www.w3.org/2000/svg' width='64' height='64'>"
+    "<rect width='64' height='64' fill='#363a4f'/></svg>",
+)
+
+cover_file_cache = FileCacheManager(
+    COVER_CACHE_DIR,
+    max_size=int(config.cover_cache_size * 1024 * 1024),
+    max_age=COVER_CACHE_MAX_AGE,
+    interval=config.song_cache_evict_interval,
+)
+cover_flight: SingleFlight[str, bytes] = SingleFlight()
+
+
+def get_cover_cache_path(url: str) -> Path:
+    return COVER_CACHE_DIR / hashlib.sha1(url.encode()).hexdigest()  # noqa: S324
+
+
+def guess_image_mime(data: bytes) -> str:
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data.startswith(b"GIF8"):
+        return "image/gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg"
+
+
+async def _download_cover(url: str) -> bytes:
+    resp = (await http_clients.get("cover").get(url)).raise_for_status()
+    data = resp.content
+    with warning_suppress(f"Failed to write cover cache for {url}"):
+        COVER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = anyio.Path(get_cover_cache_path(url))
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        await tmp_path.write_bytes(data)
+        await tmp_path.replace(path)
+    return data
+
+
+async def fetch_cover(url: str) -> bytes:
+    path = get_cover_cache_path(url)
+    if touch_cache_file(path):
+        return await anyio.Path(path).read_bytes()
+    return await cover_flight.run(url, lambda: _download_cover(url))
+
+
+async def get_cover_data_uri(url: str, timeout: float | None = None) -> str:
+    if timeout is None:
+        timeout = config.list_cover_timeout
+    try:
+        # shield the download so it still fills the cache after timeout
+        data = await asyncio.wait_for(asyncio.shield(fetch_cover(url)), timeout)
+    except asyncio.TimeoutError:
+        return PLACEHOLDER_COVER
+    except Exception as e:
+        log_exception_warning(e, f"Failed to fetch cover {url}, use placeholder")
+        return PLACEHOLDER_COVER
+    return f"data:{guess_image_mime(data)};base64,{base64.b64encode(data).decode()}"
+
+
+async def inline_covers(urls: list[str]) -> list[str]:
+    return await asyncio.gather(*(get_cover_data_uri(x) for x in urls))
@@ -0,0 +1,78 @@
+import hashlib
+import json
+from typing import Any
+
+import anyio
+from cachetools import LRUCache
+from cookit.loguru import warning_suppress
+
+from ..config import config
+from ..const import RENDER_CACHE_DIR
+from ..utils import FileCacheManager, touch_cache_file
+
+RENDER_CACHE_DISK_MAX_AGE = 86400
+
+
+class RenderedImageCache:
+    def __init__(self, memory_size: int, disk_size: int) -> None:
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._memory: LRUCache[str, bytes] = LRUCache(
+            maxsize=max(memory_size, 1),
+            getsizeof=len,
+        )
+        self.disk = FileCacheManager(
+            RENDER_CACHE_DIR,
+            max_size=disk_size,
+            max_age=RENDER_CACHE_DISK_MAX_AGE,
+            interval=config.song_cache_evict_interval,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory_size > 0 or self.disk_size > 0
+
+    @staticmethod
+    def make_key(name: str, params: dict[str, Any], render_config: Any) -> str:
+        raw = json.dumps(
+            [name, params, render_config],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if self.memory_size > 0 and len(data) <= self.memory_size:
+            self._memory[key] = data
+
+    async def get(self, key: str) -> bytes | None:
+        if (data := self._memory.get(key)) is not None:
+            return data
+        if self.disk_size <= 0:
+            return None
+        path = RENDER_CACHE_DIR / key
+        if not touch_cache_file(path):
+            return None
+        with warning_suppress(f"Failed to read rendered image cache {key}"):
+            data = await anyio.Path(path).read_bytes()
+            self._remember(key, data)
+            return data
+        return None
+
+    async def set(self, key: str, data: bytes) -> None:
+        self._remember(key, data)
+        if self.disk_size <= 0:
+            return
+        with warning_suppress(f"Failed to write rendered image cache {key}"):
+            RENDER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            path = anyio.Path(RENDER_CACHE_DIR / key)
+            tmp_path = path.with_name(f"{key}.tmp")
+            await tmp_path.write_bytes(data)
+            await tmp_path.replace(path)
+
+
+render_cache = RenderedImageCache(
+    memory_size=int(config.render_cache_size * 1024 * 1024),
+    disk_size=int(config.render_cache_disk_size * 1024 * 1024),
+)
@@ -1,19 +1,46 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypedDict
 
-from .utils import render_html, render_template
+from ..config import config
+from .cover import get_cover_data_uri
+from .utils import cached_render, render_template_image_uncached
 
 if TYPE_CHECKING:
     from ..utils import NCMLrcGroupLine
 
 
-async def render_lyrics(groups: list["NCMLrcGroupLine"]) -> bytes:
+class LyricsHeaderRenderParams(TypedDict):
+    cover: str
+    title: str
+    artists: str
+
+
+async def render_lyrics(
+    groups: list["NCMLrcGroupLine"],
+    header: LyricsHeaderRenderParams | None = None,
+) -> bytes:
     group_tuples = [[(n, r) for n, r in x.lrc.items()] for x in groups]
     sort_order = ("roma", "main", "trans")
     for group in group_tuples:
         group.sort(key=lambda x: sort_order.index(x[0]) if x[0] in sort_order else 999)
-    return await render_html(
-        await render_template(
-            "lyrics.html.jinja",
+
+    name = "lyrics.html.jinja"
+
+    async def render() -> bytes:
+        if config.render_backend == "pillow":
+            from .pillow_backend import render_lyrics as render_lyrics_pillow
+
+            return await render_lyrics_pillow(group_tuples, header)
+
+        params_header = header
+        if params_header and config.list_cover_inline:
+            params_header = {
+                **params_header,
+                "cover": await get_cover_data_uri(params_header["cover"]),
+            }
+        return await render_template_image_uncached(
+            name,
             groups=group_tuples,
-        ),
-    )
+            header=params_header,
+        )
+
+    return await cached_render(name, {"groups": group_tuples, "header": header}, render)
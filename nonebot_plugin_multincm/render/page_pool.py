@@ -0,0 +1,117 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from cookit.loguru import warning_suppress
+from nonebot import logger
+
+from ..config import config
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+
+@dataclass
+class PooledPage:
+    page: "Page"
+    uses: int = 0
+    template: str | None = None
+    """Name of the template whose shell (head, styles, fonts) is loaded"""
+
+
+class PagePool:
+    def __init__(self, size: int, max_uses: int) -> None:
+        self.size = size
+        self.max_uses = max_uses
+        self._idle: list[PooledPage] = []
+        self._semaphore = asyncio.Semaphore(size)
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def is_healthy(self, it: PooledPage) -> bool:
+        return (not it.page.is_closed()) and (
+            self.max_uses <= 0 or it.uses < self.max_uses
+        )
+
+    @staticmethod
+    async def new_page() -> PooledPage:
+        from nonebot_plugin_htmlrender import get_browser
+
+        browser = await get_browser()
+        return PooledPage(page=await browser.new_page(device_scale_factor=2))
+
+    @staticmethod
+    async def close_page(it: PooledPage) -> None:
+        with warning_suppress("Failed to close pooled page"):
+            if not it.page.is_closed():
+                await it.page.close()
+
+    def _take_idle(self, template: str | None) -> PooledPage | None:
+        # prefer a page that already has the shell of the wanted template loaded
+        for i, it in enumerate(self._idle):
+            if it.template == template:
+                return self._idle.pop(i)
+        return self._idle.pop() if self._idle else None
+
+    async def _take(self, template: str | None) -> PooledPage:
+        while it := self._take_idle(template):
+            if self.is_healthy(it):
+                return it
+            await self.close_page(it)
+        return await self.new_page()
+
+    @asynccontextmanager
+    async def acquire(self, template: str | None = None) -> AsyncIterator[PooledPage]:
+        async with self._semaphore:
+            it = await self._take(template)
+            ok = False
+            try:
+                yield it
+                ok = True
+            finally:
+                it.uses += 1
+                if ok and self.is_healthy(it):
+                    self._idle.append(it)
+                else:
+                    # page may be in a broken state, recycle it
+                    await self.close_page(it)
+
+    async def prepare(
+        self,
+        template: str,
+        shell: Callable[[], Awaitable[str]],
+    ) -> None:
+        # make sure an idle page with the shell of `template` loaded is ready
+        if (not self.enabled) or any(x.template == template for x in self._idle):
+            return
+        async with self.acquire(template) as it:
+            if it.template != template:
+                await it.page.set_content(await shell())
+                it.template = template
+
+    async def warmup(self, shells: dict[str, str]) -> None:
+        names = list(shells)
+        for i in range(self.size - len(self._idle)):
+            it = await self.new_page()
+            try:
+                if names:
+                    name = names[i % len(names)]
+                    await it.page.set_content(shells[name])
+                    it.template = name
+            except Exception:
+                await self.close_page(it)
+                raise
+            self._idle.append(it)
+        logger.debug(f"Warmed up {len(self._idle)} pages for rendering")
+
+    async def close(self) -> None:
+        pages, self._idle = self._idle, []
+        for it in pages:
+            await self.close_page(it)
+
+
+page_pool = PagePool(config.render_page_pool_size, config.render_page_max_uses)
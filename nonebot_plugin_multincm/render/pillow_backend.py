@@ -0,0 +1,427 @@
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import cache
+from io import BytesIO
+from typing import TYPE_CHECKING, TypeAlias
+
+from cookit.loguru import log_exception_warning
+from nonebot.utils import run_sync
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+from ..config import config
+from .cover import fetch_cover
+
+if TYPE_CHECKING:
+    from .card_list import TrackCardRenderParams
+    from .lyrics import LyricsHeaderRenderParams
+
+Color: TypeAlias = tuple[int, int, int]
+Font: TypeAlias = ImageFont.FreeTypeFont | ImageFont.ImageFont
+
+# keep in sync with the css variables in `templates/base.html.jinja`
+C_BG_0: Color = (0x24, 0x27, 0x3A)
+C_BG_1: Color = (0x1E, 0x20, 0x30)
+C_FG_PRI: Color = (0xA5, 0xAD, 0xCB)
+C_FG_SEC: Color = (0x80, 0x87, 0xA2)
+C_INDEX_BG: Color = (0x8A, 0xAD, 0xF4)
+C_INDEX_BG_ALPHA = 0x60
+C_COVER_PLACEHOLDER: Color = (0x36, 0x3A, 0x4F)
+
+SCALE = 2
+"""Same as the device scale factor used by the browser backend"""
+LINE_HEIGHT = 1.25
+
+PADDING = 16
+GAP = 16
+CARD_PADDING = 16
+CARD_WIDTH = 350
+CARD_RADIUS = 8
+COVER_SIZE = 64
+COVER_RADIUS = 6
+INDEX_SIZE = 32
+LYRICS_WIDTH = 600
+LYRICS_GAP = 12
+
+FALLBACK_FONTS = (
+    "msyh.ttc",
+    "PingFang.ttc",
+    "NotoSansCJK-Regular.ttc",
+    "NotoSansSC-Regular.otf",
+    "SourceHanSansSC-Regular.otf",
+    "wqy-microhei.ttc",
+    "simhei.ttf",
+)
+
+
+def s(value: float) -> int:
+    return round(value * SCALE)
+
+
+def blend(fg: Color, alpha: int, bg: Color) -> Color:
+    a = alpha / 255
+    return tuple(round(f * a + b * (1 - a)) for f, b in zip(fg, bg))  # type: ignore
+
+
+@cache
+def get_font(size: int) -> Font:
+    candidates = [config.list_font] if config.list_font else []
+    candidates.extend(FALLBACK_FONTS)
+    for x in candidates:
+        with suppress(OSError):
+            return ImageFont.truetype(x, s(size))
+    return ImageFont.load_default(s(size))
+
+
+@dataclass
+class TextStyle:
+    size: int
+    color: Color = C_FG_PRI
+    bold: bool = False
+
+    @property
+    def font(self) -> Font:
+        return get_font(self.size)
+
+    @property
+    def line_height(self) -> int:
+        return s(self.size * LINE_HEIGHT)
+
+    def width(self, text: str) -> float:
+        return self.font.getlength(text)
+
+    def ellipsize(self, text: str, max_width: float) -> str:
+        if self.width(text) <= max_width:
+            return text
+        while text and self.width(f"{text}…") > max_width:
+            text = text[:-1]
+        return f"{text}…" if text else ""
+
+    def wrap(self, text: str, max_width: float) -> list[str]:
+        # char based wrapping, good enough for CJK lyrics
+        lines: list[str] = []
+        current = ""
+        for char in text:
+            if current and self.width(current + char) > max_width:
+                lines.append(current)
+                current = ""
+            current += char
+        lines.append(current)
+        return lines
+
+    def draw(
+        self,
+        draw: ImageDraw.ImageDraw,
+        xy: tuple[float, float],
+        text: str,
+        anchor: str = "la",
+    ) -> None:
+        # vertically center the glyphs in the css line box
+        x, y = xy
+        y += (self.line_height - s(self.size)) / 2
+        draw.text(
+            (x, y),
+            text,
+            fill=self.color,
+            font=self.font,
+            anchor=anchor,
+            stroke_width=1 if self.bold else 0,
+            stroke_fill=self.color,
+        )
+
+
+ST_TITLE = TextStyle(32, bold=True)
+ST_BODY = TextStyle(16)
+ST_SMALL = TextStyle(14, color=C_FG_SEC)
+ST_CARD_TITLE = TextStyle(18, bold=True)
+ST_CARD_ALIAS = TextStyle(16, color=C_FG_SEC)
+ST_INDEX = TextStyle(12, bold=True)
+ST_LRC_TITLE = TextStyle(20, bold=True)
+ST_LRC_ARTISTS = TextStyle(16, color=C_FG_SEC)
+ST_LRC: dict[str, TextStyle] = {
+    "main": TextStyle(20, bold=True),
+    "roma": TextStyle(14),
+}
+
+
+def rounded_mask(size: tuple[int, int], radius: int) -> Image.Image:
+    mask = Image.new("L", size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle(
+        (0, 0, size[0] - 1, size[1] - 1),
+        radius,
+        255,
+    )
+    return mask
+
+
+def encode_image(img: Image.Image) -> bytes:
+    buf = BytesIO()
+    img.convert("RGB").save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+def cover_size() -> tuple[int, int]:
+    return (s(COVER_SIZE), s(COVER_SIZE))
+
+
+def load_cover(data: bytes | None) -> Image.Image:
+    if data:
+        with suppress(Exception):
+            return ImageOps.fit(Image.open(BytesIO(data)).convert("RGB"), cover_size())
+    return Image.new("RGB", cover_size(), C_COVER_PLACEHOLDER)
+
+
+def measure_card(card: "TrackCardRenderParams") -> int:
+    desc_height = (
+        ST_CARD_TITLE.line_height
+        + sum(ST_BODY.line_height + s(2) for _ in card["extras"])
+        + sum(ST_SMALL.line_height + s(2) for _ in card["small_extras"])
+    )
+    return max(s(COVER_SIZE), desc_height) + s(CARD_PADDING) * 2
+
+
+def draw_card(
+    card: "TrackCardRenderParams",
+    cover: bytes | None,
+    height: int,
+) -> Image.Image:
+    width = s(CARD_WIDTH + CARD_PADDING * 2)
+    img = Image.new("RGB", (width, height), C_BG_1)
+    draw = ImageDraw.Draw(img)
+
+    # index badge
+    index_bg = blend(C_INDEX_BG, C_INDEX_BG_ALPHA, C_BG_1)
+    draw.polygon([(0, 0), (s(INDEX_SIZE), 0), (0, s(INDEX_SIZE))], fill=index_bg)
+    index_text = str(card["index"])
+    index_img = Image.new(
+        "RGBA",
+        (int(ST_INDEX.width(index_text)) + s(4), ST_INDEX.line_height),
+        (0, 0, 0, 0),
+    )
+    ST_INDEX.draw(ImageDraw.Draw(index_img), (s(2), 0), index_text)
+    index_img = index_img.rotate(45, expand=True, resample=Image.Resampling.BICUBIC)
+    img.paste(
+        index_img,
+        (s(15) - index_img.width // 2, s(8) - index_img.height // 2),
+        index_img,
+    )
+
+    # cover
+    cover_xy = (s(CARD_PADDING), (height - s(COVER_SIZE)) // 2)
+    img.paste(
+        load_cover(cover),
+        cover_xy,
+        rounded_mask(cover_size(), s(COVER_RADIUS)),
+    )
+
+    # description
+    desc_x = s(CARD_PADDING + COVER_SIZE + 16)
+    desc_width = width - desc_x - s(CARD_PADDING)
+    desc_height = measure_card(card) - s(CARD_PADDING) * 2
+    y = (height - desc_height) // 2
+
+    title = ST_CARD_TITLE.ellipsize(card["title"], desc_width)
+    ST_CARD_TITLE.draw(draw, (desc_x, y), title)
+    title_width = ST_CARD_TITLE.width(title)
+    if card["alias"] and (rest := desc_width - title_width) > 0:
+        alias = ST_CARD_ALIAS.ellipsize(f"（{card['alias']}）", rest)
+        # align baselines of title and alias
+        baseline = (
+            y
+            + (ST_CARD_TITLE.line_height - s(ST_CARD_TITLE.size)) / 2
+            + ST_CARD_TITLE.font.getmetrics()[0]
+        )
+        draw.text(
+            (desc_x + title_width, baseline),
+            alias,
+            fill=ST_CARD_ALIAS.color,
+            font=ST_CARD_ALIAS.font,
+            anchor="ls",
+        )
+    y += ST_CARD_TITLE.line_height
+
+    extras = ((ST_BODY, card["extras"]), (ST_SMALL, card["small_extras"]))
+    for style, lines in extras:
+        for line in lines:
+            y += s(2)
+            style.draw(draw, (desc_x, y), style.ellipsize(line, desc_width))
+            y += style.line_height
+
+    return img
+
+
+def draw_centered_lines(
+    draw: ImageDraw.ImageDraw,
+    width: int,
+    y: int,
+    lines: list[tuple[TextStyle, str]],
+) -> int:
+    for style, text in lines:
+        style.draw(draw, (width / 2, y), text, anchor="ma")
+        y += style.line_height
+    return y
+
+
+def footer_lines() -> list[tuple[TextStyle, str]]:
+    from ..__init__ import __version__
+
+    return [(ST_SMALL, f"Generated by nonebot-plugin-multincm v{__version__}")]
+
+
+@run_sync
+def _render_card_list(
+    title: str,
+    cards: list["TrackCardRenderParams"],
+    covers: list[bytes | None],
+    current_page: int,
+    max_page: int,
+    total_count: int,
+) -> bytes:
+    card_width = s(CARD_WIDTH + CARD_PADDING * 2)
+    grid_width = card_width * 2 + s(GAP)
+    width = grid_width + s(PADDING) * 2
+
+    card_heights = [measure_card(x) for x in cards]
+    row_heights = [
+        max(card_heights[i : i + 2]) for i in range(0, len(card_heights), 2)
+    ]
+    grid_height = sum(row_heights) + s(GAP) * max(len(row_heights) - 1, 0)
+
+    head_lines = [
+        (ST_BODY, "直接发送 序号 进行选择 | 发送 P+数字 跳到指定页数"),
+        (ST_BODY, "其他操作：上一页(P) | 下一页(N) | 退出(E)"),
+    ]
+    page_lines = [
+        (
+            ST_BODY,
+            f"第 {current_page} 页 / 共 {max_page} 页 | 总计 {total_count} 项",
+        ),
+    ]
+    foot_lines = footer_lines()
+    height = (
+        s(PADDING) * 2
+        + s(ST_TITLE.size)
+        + sum(x.line_height for x, _ in head_lines)
+        + grid_height
+        + sum(x.line_height for x, _ in page_lines)
+        + sum(x.line_height for x, _ in foot_lines)
+        + s(GAP) * 4
+    )
+
+    img = Image.new("RGB", (width, height), C_BG_0)
+    draw = ImageDraw.Draw(img)
+    y = s(PADDING)
+    # title has line-height 1
+    title_y = y - (ST_TITLE.line_height - s(ST_TITLE.size)) / 2
+    ST_TITLE.draw(draw, (width / 2, title_y), title, "ma")
+    y += s(ST_TITLE.size) + s(GAP)
+    y = draw_centered_lines(draw, width, y, head_lines) + s(GAP)
+
+    for row, row_height in enumerate(row_heights):
+        for col in range(2):
+            if (i := row * 2 + col) >= len(cards):
+                break
+            card_img = draw_card(cards[i], covers[i], row_height)
+            x = s(PADDING) + col * (card_width + s(GAP))
+            img.paste(card_img, (x, y), rounded_mask(card_img.size, s(CARD_RADIUS)))
+        y += row_height + s(GAP)
+
+    y = draw_centered_lines(draw, width, y, page_lines) + s(GAP)
+    draw_centered_lines(draw, width, y, foot_lines)
+    return encode_image(img)
+
+
+async def fetch_cover_or_none(url: str) -> bytes | None:
+    try:
+        return await asyncio.wait_for(
+            asyncio.shield(fetch_cover(url)),
+            config.list_cover_timeout,
+        )
+    except asyncio.TimeoutError:
+        return None
+    except Exception as e:
+        log_exception_warning(e, f"Failed to fetch cover {url}, use placeholder")
+        return None
+
+
+async def render_card_list(
+    title: str,
+    cards: list["TrackCardRenderParams"],
+    current_page: int,
+    max_page: int,
+    total_count: int,
+) -> bytes:
+    covers = await asyncio.gather(*(fetch_cover_or_none(x["cover"]) for x in cards))
+    return await _render_card_list(
+        title,
+        cards,
+        covers,
+        current_page,
+        max_page,
+        total_count,
+    )
+
+
+def draw_lyrics_header(
+    img: Image.Image,
+    y: int,
+    header: "LyricsHeaderRenderParams",
+    cover: bytes | None,
+) -> None:
+    draw = ImageDraw.Draw(img)
+    x = s(PADDING)
+    img.paste(load_cover(cover), (x, y), rounded_mask(cover_size(), s(COVER_RADIUS)))
+
+    x += s(COVER_SIZE + 16)
+    max_width = s(LYRICS_WIDTH - COVER_SIZE - 16)
+    lines = ((ST_LRC_TITLE, header["title"]), (ST_LRC_ARTISTS, header["artists"]))
+    text_y = y + (s(COVER_SIZE) - sum(st.line_height for st, _ in lines)) // 2
+    for style, text in lines:
+        style.draw(draw, (x, text_y), style.ellipsize(text, max_width))
+        text_y += style.line_height
+
+
+@run_sync
+def _render_lyrics(
+    groups: list[list[tuple[str, str]]],
+    header: "LyricsHeaderRenderParams | None",
+    cover: bytes | None,
+) -> bytes:
+    width = s(LYRICS_WIDTH + PADDING * 2)
+    max_text_width = s(LYRICS_WIDTH)
+
+    blocks: list[list[tuple[TextStyle, str]]] = [
+        [
+            (style, line)
+            for name, text in group
+            for style in (ST_LRC.get(name, ST_BODY),)
+            for line in style.wrap(text, max_text_width)
+        ]
+        for group in groups
+    ]
+    blocks.append(footer_lines())
+    header_height = s(COVER_SIZE + 4 + LYRICS_GAP) if header else 0
+    height = (
+        s(PADDING) * 2
+        + header_height
+        + sum(x.line_height for block in blocks for x, _ in block)
+        + s(LYRICS_GAP) * (len(blocks) - 1)
+    )
+
+    img = Image.new("RGB", (width, height), C_BG_0)
+    draw = ImageDraw.Draw(img)
+    y = s(PADDING)
+    if header:
+        draw_lyrics_header(img, y, header, cover)
+        y += header_height
+    for block in blocks:
+        y = draw_centered_lines(draw, width, y, block) + s(LYRICS_GAP)
+    return encode_image(img)
+
+
+async def render_lyrics(
+    groups: list[list[tuple[str, str]]],
+    header: "LyricsHeaderRenderParams | None" = None,
+) -> bytes:
+    cover = await fetch_cover_or_none(header["cover"]) if header else None
+    return await _render_lyrics(groups, header, cover)
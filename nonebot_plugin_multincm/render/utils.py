@@ -1,18 +1,23 @@
+from collections.abc import Awaitable, Callable
+from functools import cache
 from pathlib import Path
-from typing import Literal, TypedDict
+from typing import Any, Literal, TypedDict
 from urllib.parse import quote
 
 import jinja2
 from cookit.jinja import make_register_jinja_filter_deco, register_all_filters
-from nonebot_plugin_htmlrender import get_new_page
+from cookit.loguru import warning_suppress
 
 from ..config import config
-from ..utils import debug
+from ..utils import SingleFlight, debug
+from .image_cache import render_cache
+from .page_pool import page_pool
 
 jinja_env = jinja2.Environment(
     loader=jinja2.FileSystemLoader(Path(__file__).parent / "templates"),
     autoescape=jinja2.select_autoescape(["html", "xml"]),
     enable_async=True,
+    auto_reload=False,
 )
 register_all_filters(jinja_env)
 
@@ -28,6 +33,7 @@ def format_font_url(url: str) -> str | None:
     return quote(p.as_uri()) if url and (p := Path(url)).exists() else url
 
 
+@cache
 def get_config() -> RenderConfig:
     from ..__init__ import __version__ as plugin_version
 
@@ -39,18 +45,31 @@ def get_config() -> RenderConfig:
     }
 
 
+@cache
+def get_template(name: str) -> jinja2.Template:
+    return jinja_env.get_template(name)
+
+
 async def render_template(name: str, **kwargs):
-    return await jinja_env.get_template(name).render_async(
+    return await get_template(name).render_async(
         config=get_config(),
         **kwargs,
     )
 
 
+async def render_template_block(name: str, block: str, **kwargs) -> str:
+    template = get_template(name)
+    context = template.new_context({"config": get_config(), **kwargs})
+    return "".join([x async for x in template.blocks[block](context)])
+
+
 async def render_html(
     html: str,
     selector: str = "main",
     image_type: Literal["jpeg", "png"] = "jpeg",
 ) -> bytes:
+    from nonebot_plugin_htmlrender import get_new_page
+
     if debug.enabled:
         debug.write(html, "{time}.html")
     async with get_new_page() as page:
@@ -58,3 +77,110 @@ async def render_html(
         elem = await page.query_selector(selector)
         assert elem
         return await elem.screenshot(type=image_type)
+
+
+SWAP_MAIN_JS = """
+async (html) => {
+  document.querySelector('main').innerHTML = html;
+  await Promise.all(
+    Array.from(document.images)
+      .filter((img) => !img.complete)
+      .map((img) => new Promise((r) => { img.onload = img.onerror = r; })),
+  );
+  await document.fonts.ready;
+}
+"""
+
+
+async def render_template_image_uncached(
+    name: str,
+    selector: str = "main",
+    image_type: Literal["jpeg", "png"] = "jpeg",
+    **kwargs,
+) -> bytes:
+    if not page_pool.enabled:
+        return await render_html(
+            await render_template(name, **kwargs),
+            selector,
+            image_type,
+        )
+
+    async with page_pool.acquire(name) as it:
+        if it.template == name:
+            # shell of this template is already loaded, only swap the content
+            html = await render_template_block(name, "main", **kwargs)
+            if debug.enabled:
+                debug.write(html, "{time}.main.html")
+            await it.page.evaluate(SWAP_MAIN_JS, html)
+        else:
+            html = await render_template(name, **kwargs)
+            if debug.enabled:
+                debug.write(html, "{time}.html")
+            await it.page.set_content(html)
+            it.template = name
+        elem = await it.page.query_selector(selector)
+        assert elem
+        return await elem.screenshot(type=image_type)
+
+
+render_flight: SingleFlight[str, bytes] = SingleFlight()
+
+
+async def cached_render(
+    name: str,
+    params: dict[str, Any],
+    render: Callable[[], Awaitable[bytes]],
+) -> bytes:
+    # `params` only identifies the image, so it can be cheaper than what
+    # `render` actually needs (e.g. cover urls instead of inlined covers),
+    # used by both render backends
+    if not render_cache.enabled:
+        return await render()
+
+    key = render_cache.make_key(
+        name,
+        params,
+        {**get_config(), "backend": config.render_backend},
+    )
+    if (img := await render_cache.get(key)) is not None:
+        return img
+
+    async def do_render():
+        img = await render()
+        await render_cache.set(key, img)
+        return img
+
+    return await render_flight.run(key, do_render)
+
+
+async def render_template_image(
+    name: str,
+    selector: str = "main",
+    image_type: Literal["jpeg", "png"] = "jpeg",
+    **kwargs,
+) -> bytes:
+    return await cached_render(
+        name,
+        {"selector": selector, "image_type": image_type, **kwargs},
+        lambda: render_template_image_uncached(name, selector, image_type, **kwargs),
+    )
+
+
+POOLED_TEMPLATES = ("card_list.html.jinja", "lyrics.html.jinja")
+
+
+async def warmup_page_pool() -> None:
+    if config.render_backend != "browser" or not page_pool.enabled:
+        return
+    with warning_suppress("Failed to warm up render page pool"):
+        await page_pool.warmup(
+            {name: await render_template(name) for name in POOLED_TEMPLATES},
+        )
+
+
+async def prepare_template_page(name: str) -> None:
+    # get a pooled page ready before the render parameters are known
+    if config.render_backend != "browser" or not page_pool.enabled:
+        return
+    with warning_suppress(f"Failed to prepare render page for {name}"):
+        await page_pool.prepare(name, lambda: render_template(name))
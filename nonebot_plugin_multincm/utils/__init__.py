@@ -9,7 +9,6 @@ from .base import (
     cut_string as cut_string,
     debug as debug,
     encode_silk as encode_silk,
-    ffmpeg_exists as ffmpeg_exists,
     format_alias as format_alias,
     format_artists as format_artists,
     format_time as format_time,
@@ -18,6 +17,23 @@ from .base import (
     is_song_card_supported as is_song_card_supported,
     merge_alias as merge_alias,
 )
+from .concurrency import SingleFlight as SingleFlight
+from .ffmpeg import (
+    FFmpegCapability as FFmpegCapability,
+    FFmpegProber as FFmpegProber,
+    ffmpeg_exists as ffmpeg_exists,
+    ffmpeg_prober as ffmpeg_prober,
+)
+from .file_cache import (
+    FileCacheManager as FileCacheManager,
+    song_file_cache as song_file_cache,
+    touch_cache_file as touch_cache_file,
+)
+from .http import (
+    ClientPurpose as ClientPurpose,
+    HttpClientManager as HttpClientManager,
+    http_clients as http_clients,
+)
 from .lrc_parser import (
     NCM_MAIN_LRC_GROUP as NCM_MAIN_LRC_GROUP,
     LrcGroupLine as LrcGroupLine,
@@ -28,3 +44,9 @@ from .lrc_parser import (
     normalize_lrc as normalize_lrc,
     parse_lrc as parse_lrc,
 )
+from .transcode import (
+    TranscodeScheduler as TranscodeScheduler,
+    TranscodeStats as TranscodeStats,
+    transcode_scheduler as transcode_scheduler,
+    transcode_silk as transcode_silk,
+)
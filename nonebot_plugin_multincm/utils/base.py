@@ -12,6 +12,7 @@ from nonebot_plugin_alconna.uniseg import SupportScope, get_target
 from yarl import URL
 
 from ..config import config
+from .file_cache import touch_cache_file
 
 if TYPE_CHECKING:
     from ..data_source import md
@@ -87,45 +88,107 @@ def cut_string(text: str, length: int = 50) -> str:
     return text[: length - 1] + "…"
 
 
-async def ffmpeg_exists() -> bool:
-    proc = await asyncio.create_subprocess_exec(
-        config.ffmpeg_executable,
-        "-version",
-        stdin=asyncio.subprocess.DEVNULL,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    code = await proc.wait()
-    return code == 0
+class AsyncQueueReader:
+    # blocking file-like reader for worker threads, pulling chunks from an asyncio
+    # queue living in the event loop, empty chunk means EOF
+
+    def __init__(
+        self,
+        queue: "asyncio.Queue[bytes]",
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        self.queue = queue
+        self.loop = loop
+        self._buffer = bytearray()
+        self._eof = False
+
+    def _fill(self) -> None:
+        chunk = asyncio.run_coroutine_threadsafe(self.queue.get(), self.loop).result()
+        if chunk:
+            self._buffer += chunk
+        else:
+            self._eof = True
+
+    def read(self, size: int = -1) -> bytes:
+        while (not self._eof) and (size < 0 or len(self._buffer) < size):
+            self._fill()
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+SILK_STREAM_CHUNK_SIZE = 64 * 1024
+SILK_STREAM_QUEUE_SIZE = 16
+FFMPEG_STDERR_TAIL_SIZE = 4 * 1024
 
 
 async def encode_silk(path: "Path", rate: int = 24000) -> "Path":
     silk_path = path.with_suffix(".silk")
-    if silk_path.exists():
+    if touch_cache_file(silk_path):
         return silk_path
 
-    pcm_path = path.with_suffix(".pcm")
+    from pysilk import encode
+
+    # pipe pcm from ffmpeg stdout into the encoder directly, no temp pcm file
     proc = await asyncio.create_subprocess_exec(
         config.ffmpeg_executable,
-        "-y",
+        "-loglevel", "error",
         "-i", str(path),
-        "-f", "s16le", "-ar", f"{rate}", "-ac", "1", str(pcm_path),
+        "-f", "s16le", "-ar", f"{rate}", "-ac", "1", "-",
         stdin=asyncio.subprocess.DEVNULL,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
     )  # fmt: skip
-    code = await proc.wait()
-    if code != 0:
-        raise RuntimeError(
-            f"Failed to use ffmpeg to convert {path} to pcm, return code {code}",
-        )
-
+    assert proc.stdout
+    assert proc.stderr
+    stdout = proc.stdout
+    stderr = proc.stderr
+    stderr_tail = bytearray()
+    queue: asyncio.Queue[bytes] = asyncio.Queue(SILK_STREAM_QUEUE_SIZE)
+    tmp_path = silk_path.with_name(f"{silk_path.name}.tmp")
+
+    async def feed():
+        while chunk := await stdout.read(SILK_STREAM_CHUNK_SIZE):
+            await queue.put(chunk)
+        await queue.put(b"")
+
+    # keep reading stderr so ffmpeg won't block on a full pipe when it is
+    # logging a lot (e.g. one line per corrupted frame), only keep the tail
+    async def drain():
+        while chunk := await stderr.read(SILK_STREAM_CHUNK_SIZE):
+            stderr_tail.extend(chunk)
+            del stderr_tail[:-FFMPEG_STDERR_TAIL_SIZE]
+
+    def do_encode(reader: AsyncQueueReader):
+        with tmp_path.open("wb") as f:
+            encode(reader, f, rate, rate)
+
+    feeder = asyncio.create_task(feed())
+    drainer = asyncio.create_task(drain())
     try:
-        from pysilk import encode
-
-        await run_sync(encode)(pcm_path.open("rb"), silk_path.open("wb"), rate, rate)
+        await run_sync(do_encode)(AsyncQueueReader(queue, asyncio.get_running_loop()))
+        code = await proc.wait()
+        if code != 0:
+            await drainer
+            err = stderr_tail.decode(errors="replace").strip()
+            raise RuntimeError(
+                f"Failed to use ffmpeg to convert {path} to pcm, return code {code}"
+                f"{f': {err}' if err else ''}",
+            )
+        tmp_path.replace(silk_path)
     finally:
-        pcm_path.unlink(missing_ok=True)
+        feeder.cancel()
+        drainer.cancel()
+        # unblock the encoder thread if we are leaving early
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(b"")
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        tmp_path.unlink(missing_ok=True)
 
     return silk_path
 
@@ -0,0 +1,29 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[K, T]):
+    def __init__(self) -> None:
+        self._running: dict[K, asyncio.Future[T]] = {}
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._running
+
+    def __len__(self) -> int:
+        return len(self._running)
+
+    def _forget(self, key: K, fut: "asyncio.Future[T]") -> None:
+        if self._running.get(key) is fut:
+            del self._running[key]
+
+    async def run(self, key: K, func: Callable[[], Awaitable[T]]) -> T:
+        if (fut := self._running.get(key)) is None:
+            fut = asyncio.ensure_future(func())
+            self._running[key] = fut
+            fut.add_done_callback(lambda _: self._forget(key, fut))
+        # one waiter cancelled should not cancel the others
+        return await asyncio.shield(fut)
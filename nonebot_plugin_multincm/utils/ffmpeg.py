@@ -0,0 +1,127 @@
+import asyncio
+import re
+import shutil
+import time
+from dataclasses import dataclass, field
+
+from cookit.loguru import warning_suppress
+from nonebot import logger
+
+from ..config import config
+
+FFMPEG_PROBE_RETRY_INTERVAL = 60
+
+
+@dataclass
+class FFmpegCapability:
+    available: bool
+    path: str | None = None
+    version: str | None = None
+    codecs: frozenset[str] = field(default_factory=frozenset)
+    probed_at: float = field(default_factory=time.time)
+
+
+async def run_ffmpeg_info(*args: str) -> str | None:
+    proc = await asyncio.create_subprocess_exec(
+        config.ffmpeg_executable,
+        "-hide_banner",
+        *args,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    stdout, _ = await proc.communicate()
+    if proc.returncode != 0:
+        return None
+    return stdout.decode(errors="replace")
+
+
+def parse_ffmpeg_codecs(output: str) -> frozenset[str]:
+    # lines after the separator look like ` DEA.L. aac   AAC (Advanced Audio Coding)`
+    _, _, body = output.partition("-------")
+    return frozenset(
+        m[1]
+        for line in body.splitlines()
+        if (m := re.match(r"\s*\S{6}\s+(\S+)", line))
+    )
+
+
+async def probe_ffmpeg() -> FFmpegCapability:
+    with warning_suppress("Failed to probe FFmpeg"):
+        if (version_output := await run_ffmpeg_info("-version")) is None:
+            return FFmpegCapability(available=False)
+        m = re.match(r"ffmpeg version (\S+)", version_output)
+        codecs_output = await run_ffmpeg_info("-codecs")
+        return FFmpegCapability(
+            available=True,
+            path=shutil.which(config.ffmpeg_executable) or config.ffmpeg_executable,
+            version=m[1] if m else None,
+            codecs=(
+                parse_ffmpeg_codecs(codecs_output) if codecs_output else frozenset()
+            ),
+        )
+    return FFmpegCapability(available=False)
+
+
+class FFmpegProber:
+    def __init__(self) -> None:
+        self.capability: FFmpegCapability | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def _should_probe(self) -> bool:
+        cap = self.capability
+        return (cap is None) or (
+            (not cap.available)
+            and (time.time() - cap.probed_at >= FFMPEG_PROBE_RETRY_INTERVAL)
+        )
+
+    async def _probe(self) -> FFmpegCapability:
+        self.capability = cap = await probe_ffmpeg()
+        if cap.available:
+            logger.debug(
+                f"FFmpeg {cap.version} found at {cap.path}, "
+                f"{len(cap.codecs)} codecs supported",
+            )
+        else:
+            logger.warning("FFmpeg 无法使用，发送语音时将不会把音乐文件转为 silk 格式")
+        return cap
+
+    async def probe(self) -> FFmpegCapability:
+        async with self._lock:
+            return await self._probe()
+
+    def invalidate(self) -> None:
+        self.capability = None
+
+    async def get(self) -> FFmpegCapability:
+        if self._should_probe():
+            async with self._lock:
+                if self._should_probe():
+                    return await self._probe()
+        assert self.capability
+        return self.capability
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe()
+            if config.ffmpeg_probe_interval <= 0:
+                return
+            await asyncio.sleep(config.ffmpeg_probe_interval)
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+ffmpeg_prober = FFmpegProber()
+
+
+async def ffmpeg_exists() -> bool:
+    return (await ffmpeg_prober.get()).available
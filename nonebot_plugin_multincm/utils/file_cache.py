@@ -0,0 +1,115 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from cookit.loguru import warning_suppress
+from nonebot import logger
+from nonebot.utils import run_sync
+
+from ..config import config
+from ..const import SONG_CACHE_DIR
+
+
+def touch_cache_file(path: Path) -> bool:
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+@dataclass
+class CacheEntry:
+    files: list[Path] = field(default_factory=list)
+    size: int = 0
+    last_used: float = 0
+
+
+class FileCacheManager:
+    def __init__(
+        self,
+        directory: Path,
+        max_size: int,
+        max_age: int,
+        interval: int,
+    ) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.max_age = max_age
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def _collect_entries(self) -> dict[str, CacheEntry]:
+        # derived files (e.g. `.silk` from `encode_silk`) share the stem of their
+        # source file, so they are evicted together with it
+        entries: dict[str, CacheEntry] = {}
+        for path in self.directory.iterdir():
+            if not path.is_file():
+                continue
+            with warning_suppress(f"Failed to stat cache file {path}"):
+                stat = path.stat()
+                entry = entries.setdefault(path.stem, CacheEntry())
+                entry.files.append(path)
+                entry.size += stat.st_size
+                entry.last_used = max(entry.last_used, stat.st_mtime)
+        return entries
+
+    def _remove_entry(self, entry: CacheEntry) -> None:
+        for path in entry.files:
+            with warning_suppress(f"Failed to delete cache file {path}"):
+                path.unlink(missing_ok=True)
+
+    def evict_sync(self) -> tuple[int, int]:
+        if not self.directory.exists():
+            return 0, 0
+
+        entries = sorted(self._collect_entries().values(), key=lambda x: x.last_used)
+        total_size = sum(x.size for x in entries)
+        min_time = (time.time() - self.max_age) if self.max_age > 0 else None
+
+        removed_count = removed_size = 0
+        for entry in entries:
+            expired = min_time is not None and entry.last_used < min_time
+            oversize = self.max_size > 0 and total_size > self.max_size
+            if not (expired or oversize):
+                # entries are sorted by last used time, rest ones are newer
+                break
+            self._remove_entry(entry)
+            total_size -= entry.size
+            removed_count += 1
+            removed_size += entry.size
+        return removed_count, removed_size
+
+    async def evict(self) -> None:
+        count, size = await run_sync(self.evict_sync)()
+        if count:
+            logger.info(
+                f"Evicted {count} cached items ({size / 1024 / 1024:.2f} MiB) "
+                f"from {self.directory}",
+            )
+
+    async def _run(self) -> None:
+        while True:
+            with warning_suppress(f"Failed to evict cache in {self.directory}"):
+                await self.evict()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+song_file_cache = FileCacheManager(
+    SONG_CACHE_DIR,
+    max_size=int(config.song_cache_max_size * 1024 * 1024),
+    max_age=config.song_cache_max_age,
+    interval=config.song_cache_evict_interval,
+)
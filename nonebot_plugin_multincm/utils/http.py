@@ -0,0 +1,55 @@
+from importlib.util import find_spec
+from typing import Literal, TypeAlias
+
+from httpx import AsyncClient, Limits
+
+from ..config import config
+
+ClientPurpose: TypeAlias = Literal["ncm", "download", "resolve", "sign", "cover"]
+
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+
+def get_purpose_timeout(purpose: ClientPurpose) -> float:
+    return {
+        "ncm": config.request_timeout,
+        "sign": config.card_sign_timeout,
+        "cover": config.list_cover_timeout,
+    }.get(purpose, config.http_timeout)
+
+
+def build_client(purpose: ClientPurpose) -> AsyncClient:
+    return AsyncClient(
+        follow_redirects=True,
+        timeout=get_purpose_timeout(purpose),
+        limits=Limits(
+            max_connections=config.http_max_connections,
+            max_keepalive_connections=config.http_max_keepalive_connections,
+            keepalive_expiry=config.http_keepalive_expiry,
+        ),
+        http2=config.http2 and HTTP2_AVAILABLE,
+    )
+
+
+class HttpClientManager:
+    def __init__(self) -> None:
+        self._clients: dict[ClientPurpose, AsyncClient] = {}
+
+    def get(self, purpose: ClientPurpose) -> AsyncClient:
+        cli = self._clients.get(purpose)
+        if (not cli) or cli.is_closed:
+            cli = self._clients[purpose] = build_client(purpose)
+        return cli
+
+    def set(self, purpose: ClientPurpose, client: AsyncClient) -> None:
+        # mainly for injecting a client pointing to a mock server in tests
+        self._clients[purpose] = client
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for cli in clients:
+            await cli.aclose()
+
+
+http_clients = HttpClientManager()
@@ -10,7 +10,7 @@ if TYPE_CHECKING:
 SK = TypeVar("SK", bound=str)
 
 
-@dataclass
+@dataclass(slots=True)
 class LrcLine:
     time: int
     """Lyric Time (ms)"""
@@ -19,15 +19,17 @@ class LrcLine:
     skip_merge: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class LrcGroupLine(Generic[SK]):
     time: int
     """Lyric Time (ms)"""
     lrc: dict[SK, str]
 
 
-LRC_TIME_REGEX = r"(?P<min>\d+):(?P<sec>\d+)([\.:](?P<mili>\d+))?(-(?P<meta>\d))?"
-LRC_LINE_REGEX = re.compile(rf"^((\[{LRC_TIME_REGEX}\])+)(?P<lrc>.*)$", re.MULTILINE)
+LRC_TAG_PATTERN = r"\[(\d+):(\d+)(?:[\.:](\d+))?(?:-(\d))?\]"
+LRC_TAG_REGEX = re.compile(LRC_TAG_PATTERN)
+LRC_TAGS_PREFIX_REGEX = re.compile(rf"(?:{LRC_TAG_PATTERN})+")
+LRC_SKIP_MERGE_PREFIXES = ("作词", "作曲", "编曲")
 
 
 def parse_lrc(
@@ -35,25 +37,19 @@ def parse_lrc(
     ignore_empty: bool = False,
     merge_empty: bool = True,
 ) -> list[LrcLine]:
-    parsed = []
-    for line in re.finditer(LRC_LINE_REGEX, lrc):
-        lrc = line["lrc"].strip().replace("\u3000", " ")
-        times = [x.groupdict() for x in re.finditer(LRC_TIME_REGEX, line[0])]
-
-        parsed.extend(
-            [
-                LrcLine(
-                    time=(
-                        int(i["min"]) * 60 * 1000
-                        + int(float(f"{i['sec']}.{i['mili'] or 0}") * 1000)
-                    ),
-                    lrc=lrc,
-                    skip_merge=bool(i["meta"])
-                    or lrc.startswith(("作词", "作曲", "编曲")),
-                )
-                for i in times
-            ],
-        )
+    parsed: list[LrcLine] = []
+    for line in lrc.split("\n"):
+        if not (prefix := LRC_TAGS_PREFIX_REGEX.match(line)):
+            continue
+
+        tags_end = prefix.end()
+        content = line[tags_end:].strip().replace("\u3000", " ")
+        skip_merge = content.startswith(LRC_SKIP_MERGE_PREFIXES)
+        for minute, sec, mili, meta in LRC_TAG_REGEX.findall(line, 0, tags_end):
+            time = int(minute) * 60000 + int(sec) * 1000
+            if mili:
+                time += int((mili + "00")[:3])
+            parsed.append(LrcLine(time, content, skip_merge or bool(meta)))
 
     if ignore_empty:
         parsed = [x for x in parsed if x.lrc]
@@ -74,12 +70,6 @@ def parse_lrc(
     return parsed
 
 
-def strip_lrc_lines(lines: list[LrcLine]) -> list[LrcLine]:
-    for lrc in lines:
-        lrc.lrc = lrc.lrc.strip()
-    return lines
-
-
 def merge_lrc(
     lyric_groups: dict[SK, list[LrcLine]],
     main_group: SK | None = None,
@@ -87,65 +77,83 @@ def merge_lrc(
     replace_empty_line: str | None = None,
     skip_merge_group_name: SK | None = None,
 ) -> list[LrcGroupLine[SK]]:
-    lyric_groups = {k: v.copy() for k, v in lyric_groups.items()}
-    for v in lyric_groups.values():
-        while not v[-1].lrc:
-            v.pop()
-
-    if main_group is None:
-        main_group, main_lyric = next(iter(lyric_groups.items()))
-    else:
-        main_lyric = lyric_groups[main_group]
-    main_lyric = strip_lrc_lines(main_lyric)
+    # all lyrics should be sorted by time, as `parse_lrc` returns
 
-    lyric_groups.pop(main_group)
-    sub_lines = [(n, strip_lrc_lines(x)) for n, x in lyric_groups.items()]
+    def trim_end(lines: list[LrcLine]) -> int:
+        end = len(lines)
+        while end and not lines[end - 1].lrc:
+            end -= 1
+        return end
 
-    if replace_empty_line:
-        for x in main_lyric:
-            if not x.lrc:
-                x.lrc = replace_empty_line
-                x.skip_merge = True
+    if main_group is None:
+        main_group = next(iter(lyric_groups))
+    main_lyric = lyric_groups[main_group]
+    main_end = trim_end(main_lyric)
+
+    # per sub group: (name, lines, end, texts)
+    sub_groups = [
+        (n, x, end, [y.lrc.strip() for y in x[:end]])
+        for n, x in lyric_groups.items()
+        if n != main_group and (end := trim_end(x))
+    ]
+    # lines before `consumed` are merged or dropped,
+    # lines before `scanned` can not match any later main line
+    consumed = [0] * len(sub_groups)
+    scanned = [0] * len(sub_groups)
 
     merged: list[LrcGroupLine] = []
-    for main_line in main_lyric:
-        if not main_line.lrc:
-            continue
+    last_time: int | None = None
+    for main_line in main_lyric[:main_end]:
+        text = main_line.lrc.strip()
+        skip_merge = main_line.skip_merge
+        if not text:
+            if not replace_empty_line:
+                continue
+            text = replace_empty_line
+            skip_merge = True
 
         main_time = main_line.time
-        line_main_group = (
-            skip_merge_group_name
-            if main_line.skip_merge and skip_merge_group_name
-            else main_group
-        )
         line_group = LrcGroupLine(
             time=main_time,
-            lrc={line_main_group: main_line.lrc},
+            lrc={
+                (
+                    skip_merge_group_name
+                    if skip_merge and skip_merge_group_name
+                    else main_group
+                ): text,
+            },
         )
-
-        for group, sub_lrc in sub_lines:
-            for i, line in enumerate(sub_lrc):
-                if (not line.lrc) or main_line.skip_merge:
-                    continue
-
-                if (main_time - threshold) <= line.time < (main_time + threshold):
-                    for _ in range(i + 1):
-                        it = sub_lrc.pop(0)  # noqa: B909
-                        if it.lrc:
-                            line_group.lrc[group] = it.lrc
-                    break
-
         merged.append(line_group)
+        if skip_merge:
+            continue
 
-    rest_lrc_len = max(len(x[1]) for x in sub_lines) if sub_lines else 0
+        if last_time is not None and main_time < last_time:
+            scanned = consumed.copy()
+        last_time = main_time
+
+        min_time = main_time - threshold
+        max_time = main_time + threshold
+        for i, (group, lines, end, texts) in enumerate(sub_groups):
+            j = scanned[i]
+            while j < end and ((not texts[j]) or lines[j].time < min_time):
+                j += 1
+            scanned[i] = j
+            if j < end and lines[j].time < max_time:
+                line_group.lrc[group] = texts[j]
+                consumed[i] = scanned[i] = j + 1
+
+    rest_lrc_len = max(
+        (end - consumed[i] for i, (_, _, end, _) in enumerate(sub_groups)),
+        default=0,
+    )
     if rest_lrc_len:
+        extra_time = merged[-1].time + 1000
         extra_lines = [
-            LrcGroupLine(time=merged[-1].time + 1000, lrc={})
-            for _ in range(rest_lrc_len)
+            LrcGroupLine(time=extra_time, lrc={}) for _ in range(rest_lrc_len)
         ]
-        for group, line in sub_lines:
-            for target, extra in zip(extra_lines, line):
-                target.lrc[group] = extra.lrc
+        for i, (group, _, end, texts) in enumerate(sub_groups):
+            for target, text in zip(extra_lines, texts[consumed[i] : end]):
+                target.lrc[group] = text
 
     return merged
 
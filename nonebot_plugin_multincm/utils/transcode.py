@@ -0,0 +1,91 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from nonebot import logger
+
+from ..config import config
+from .base import encode_silk
+from .concurrency import SingleFlight
+from .file_cache import touch_cache_file
+
+
+@dataclass
+class TranscodeStats:
+    concurrency: int
+    waiting: int
+    running: int
+    finished: int
+    last_wait_time: float
+    average_wait_time: float
+
+
+class TranscodeScheduler:
+    def __init__(self, concurrency: int) -> None:
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._flight: SingleFlight[Path, Path] = SingleFlight()
+        self._waiting = 0
+        self._running = 0
+        self._finished = 0
+        self._last_wait_time = 0.0
+        self._total_wait_time = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    @property
+    def stats(self) -> TranscodeStats:
+        return TranscodeStats(
+            concurrency=self.concurrency,
+            waiting=self._waiting,
+            running=self._running,
+            finished=self._finished,
+            last_wait_time=self._last_wait_time,
+            average_wait_time=(
+                (self._total_wait_time / self._finished) if self._finished else 0.0
+            ),
+        )
+
+    async def _run(self, func: Callable[[], Awaitable[Path]]) -> Path:
+        enqueue_time = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            wait_time = time.perf_counter() - enqueue_time
+            self._last_wait_time = wait_time
+            self._total_wait_time += wait_time
+            self._running += 1
+            logger.debug(
+                f"Transcode job started after waiting {wait_time:.3f}s, "
+                f"running {self._running}, queued {self._waiting}",
+            )
+            return await func()
+        finally:
+            self._running -= 1
+            self._finished += 1
+            self._semaphore.release()
+
+    async def submit(self, key: Path, func: Callable[[], Awaitable[Path]]) -> Path:
+        # jobs producing the same output are only run once
+        return await self._flight.run(key, lambda: self._run(func))
+
+
+transcode_scheduler = TranscodeScheduler(
+    config.transcode_concurrency or os.cpu_count() or 1,
+)
+
+
+async def transcode_silk(path: Path) -> Path:
+    silk_path = path.with_suffix(".silk")
+    if touch_cache_file(silk_path):
+        return silk_path
+    return await transcode_scheduler.submit(silk_path, lambda: encode_silk(path))
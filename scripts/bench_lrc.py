@@ -0,0 +1,109 @@
+"""Benchmark lyric processing against the reference implementations in tests.
+
+Run from the repository root with test dependencies installed:
+
+    python scripts/bench_lrc.py
+"""
+
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import nonebot
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+nonebot.init()
+nonebot.require("nonebot_plugin_multincm")
+
+from nonebot_plugin_multincm.utils.lrc_parser import (  # noqa: E402
+    LrcLine,
+    merge_lrc,
+    parse_lrc,
+)
+from tests import lrc_reference as reference  # noqa: E402
+
+SIZES = (1000, 5000, 10000)
+REPEAT = 5
+
+
+def best_of(func: Callable[[], object], repeat: int = REPEAT) -> float:
+    times: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def format_results(results: dict[str, float]) -> str:
+    return " | ".join(f"{k} {v * 1000:.1f}ms" for k, v in results.items())
+
+
+def make_merge_groups(size: int) -> dict[str, list[LrcLine]]:
+    # main, translation slightly after it, romaji on every other line
+    return {
+        "main": [LrcLine(i * 100, f"m{i}") for i in range(size)],
+        "trans": [LrcLine(i * 100 + 5, f"t{i}") for i in range(size)],
+        "roma": [LrcLine(i * 100 - 3, f"r{i}") for i in range(0, size, 2)],
+    }
+
+
+def bench_merge():
+    print("merge_lrc (main + trans + roma)")
+    for size in SIZES:
+        groups = make_merge_groups(size)
+        results = {
+            name: best_of(
+                lambda func=func: func(
+                    groups,
+                    main_group="main",
+                    replace_empty_line="-",
+                    skip_merge_group_name="meta",
+                ),
+                # quadratic, one run is enough
+                repeat=1 if name == "reference" else REPEAT,
+            )
+            for name, func in (
+                ("reference", reference.merge_lrc),
+                ("current", merge_lrc),
+            )
+        }
+        print(f"  {size:>6} lines: {format_results(results)}")
+
+
+def format_tag(ms: int) -> str:
+    return f"[{ms // 60000:02d}:{ms // 1000 % 60:02d}.{ms % 1000:03d}]"
+
+
+def make_lrc(size: int, tags_per_line: int) -> str:
+    # repeated lines share one line with multiple time tags
+    return "\n".join(
+        "".join(format_tag(i * 300 + j * 60000) for j in range(tags_per_line))
+        + f"line {i}"
+        for i in range(size)
+    )
+
+
+def bench_parse():
+    print("parse_lrc")
+    for tags_per_line in (1, 3):
+        for size in SIZES:
+            lrc = make_lrc(size, tags_per_line)
+            results = {
+                name: best_of(lambda func=func: func(lrc))
+                for name, func in (
+                    ("reference", reference.parse_lrc),
+                    ("current", parse_lrc),
+                )
+            }
+            print(
+                f"  {size:>6} lines x {tags_per_line} tags: "
+                f"{format_results(results)}",
+            )
+
+
+if __name__ == "__main__":
+    bench_merge()
+    bench_parse()
@@ -0,0 +1,164 @@
+"""Benchmark card list HTML generation, per-card renders vs the single pass macro.
+
+Only the template rendering is timed, no browser is involved.
+Run from the repository root with the plugin dependencies installed:
+
+    python scripts/bench_render.py
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import jinja2
+import nonebot
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+nonebot.init()
+nonebot.require("nonebot_plugin_multincm")
+
+from cookit.jinja import register_all_filters  # noqa: E402
+
+from nonebot_plugin_multincm.render import TrackCardRenderParams  # noqa: E402
+from nonebot_plugin_multincm.render.utils import (  # noqa: E402
+    get_config,
+    jinja_env,
+    render_template,
+    render_template_block,
+)
+
+CARD_COUNTS = (20, 50, 100)
+REPEAT = 50
+
+# track card template before it became a macro, rendered once per card
+OLD_TRACK_CARD = """\
+<div class="card song">
+  <div class="index">
+    <span>{{ index }}</span>
+  </div>
+  <div class="inner">
+    <img class="cover" src="{{ cover }}" />
+    <div class="desc">
+      <div class="title">{{ title }}{% if alias %}<span>（{{ alias }}）</span>{% endif %}</div>
+      {% for x in extras %}<div>{{ x }}</div>{% endfor %}
+      {% for x in small_extras %}<div class="small">{{ x }}</div>{% endfor %}
+    </div>
+  </div>
+</div>
+"""
+
+
+def make_old_env() -> jinja2.Environment:
+    # card list template joining pre-rendered cards,
+    # in an environment loading templates the way it used to
+    templates_dir = Path(jinja_env.loader.searchpath[0])  # type: ignore
+    card_list = (
+        (templates_dir / "card_list.html.jinja")
+        .read_text("u8")
+        .replace("{%- from 'track_card.html.jinja' import track_card -%}\n", "")
+        .replace("{{ track_card(c) }}", "{{ c | safe }}")
+    )
+    env = jinja2.Environment(
+        loader=jinja2.ChoiceLoader(
+            [
+                jinja2.DictLoader(
+                    {
+                        "card_list.html.jinja": card_list,
+                        "track_card.html.jinja": OLD_TRACK_CARD,
+                    },
+                ),
+                jinja2.FileSystemLoader(templates_dir),
+            ],
+        ),
+        autoescape=jinja2.select_autoescape(["html", "xml"]),
+        enable_async=True,
+    )
+    register_all_filters(env)
+    return env
+
+
+def make_cards(count: int) -> list[TrackCardRenderParams]:
+    return [
+        {
+            "index": i,
+            "cover": f"https://p1.music.126.net/{i}.jpg?param=64y64",
+            "title": f"歌曲 {i}",
+            "alias": f"Song {i}" if i % 3 else "",
+            "extras": [f"歌手 {i}、歌手 {i + 1}"],
+            "small_extras": [f"03:{i % 60:02d} | 热度 {i % 100}"],
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_list_params(cards: list) -> dict:
+    return {
+        "title": "歌曲列表",
+        "cards": cards,
+        "current_page": 1,
+        "max_page": 5,
+        "total_count": 100,
+    }
+
+
+async def render_old(env: jinja2.Environment, cards: list[TrackCardRenderParams]):
+    config = get_config()
+    htmls = await asyncio.gather(
+        *(
+            env.get_template("track_card.html.jinja").render_async(
+                config=config,
+                **x,
+            )
+            for x in cards
+        ),
+    )
+    return await env.get_template("card_list.html.jinja").render_async(
+        config=config,
+        **make_list_params(htmls),
+    )
+
+
+async def render_new(cards: list[TrackCardRenderParams]):
+    return await render_template("card_list.html.jinja", **make_list_params(cards))
+
+
+async def render_new_block(cards: list[TrackCardRenderParams]):
+    # what a pooled page with the template already loaded renders
+    return await render_template_block(
+        "card_list.html.jinja",
+        "main",
+        **make_list_params(cards),
+    )
+
+
+async def best_of(func: Callable[[], Awaitable[object]]) -> float:
+    await func()  # warm up template compiling
+    times: list[float] = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        await func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+async def main():
+    old_env = make_old_env()
+    print(f"card list html generation, best of {REPEAT}")
+    for count in CARD_COUNTS:
+        cards = make_cards(count)
+        results = {
+            "per card": await best_of(lambda: render_old(old_env, cards)),
+            "macro": await best_of(lambda: render_new(cards)),
+            "macro (main block)": await best_of(lambda: render_new_block(cards)),
+        }
+        print(
+            f"  {count:>4} cards: "
+            + " | ".join(f"{k} {v * 1000:.2f}ms" for k, v in results.items()),
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,15 @@
+import nonebot
+import pytest
+from nonebug import NONEBOT_INIT_KWARGS
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[NONEBOT_INIT_KWARGS] = {
+        "ncm_anonymous": True,
+        "ncm_metadata_cache": False,
+    }
+
+
+@pytest.fixture(scope="session", autouse=True)
+def load_plugin(nonebug_init: None):
+    nonebot.require("nonebot_plugin_multincm")
@@ -0,0 +1,129 @@
+# straightforward lyric implementations from before they were optimized,
+# kept as the reference the optimized ones must match
+
+import re
+
+from nonebot_plugin_multincm.utils.lrc_parser import SK, LrcGroupLine, LrcLine
+
+LRC_TIME_REGEX = r"(?P<min>\d+):(?P<sec>\d+)([\.:](?P<mili>\d+))?(-(?P<meta>\d))?"
+LRC_LINE_REGEX = re.compile(rf"^((\[{LRC_TIME_REGEX}\])+)(?P<lrc>.*)$", re.MULTILINE)
+
+
+def parse_lrc(
+    lrc: str,
+    ignore_empty: bool = False,
+    merge_empty: bool = True,
+) -> list[LrcLine]:
+    parsed = []
+    for line in re.finditer(LRC_LINE_REGEX, lrc):
+        lrc = line["lrc"].strip().replace("\u3000", " ")
+        times = [x.groupdict() for x in re.finditer(LRC_TIME_REGEX, line[0])]
+
+        parsed.extend(
+            [
+                LrcLine(
+                    time=(
+                        int(i["min"]) * 60 * 1000
+                        + int(float(f"{i['sec']}.{i['mili'] or 0}") * 1000)
+                    ),
+                    lrc=lrc,
+                    skip_merge=bool(i["meta"])
+                    or lrc.startswith(("作词", "作曲", "编曲")),
+                )
+                for i in times
+            ],
+        )
+
+    if ignore_empty:
+        parsed = [x for x in parsed if x.lrc]
+
+    elif merge_empty:
+        new_parsed = []
+
+        for line in parsed:
+            if line.lrc or (new_parsed and new_parsed[-1].lrc and (not line.lrc)):
+                new_parsed.append(line)
+
+        if new_parsed and (not new_parsed[-1].lrc):
+            new_parsed.pop()
+
+        parsed = new_parsed
+
+    parsed.sort(key=lambda x: x.time)
+    return parsed
+
+
+def strip_lrc_lines(lines: list[LrcLine]) -> list[LrcLine]:
+    for lrc in lines:
+        lrc.lrc = lrc.lrc.strip()
+    return lines
+
+
+def merge_lrc(
+    lyric_groups: dict[SK, list[LrcLine]],
+    main_group: SK | None = None,
+    threshold: int = 20,
+    replace_empty_line: str | None = None,
+    skip_merge_group_name: SK | None = None,
+) -> list[LrcGroupLine[SK]]:
+    lyric_groups = {k: v.copy() for k, v in lyric_groups.items()}
+    for v in lyric_groups.values():
+        while not v[-1].lrc:
+            v.pop()
+
+    if main_group is None:
+        main_group, main_lyric = next(iter(lyric_groups.items()))
+    else:
+        main_lyric = lyric_groups[main_group]
+    main_lyric = strip_lrc_lines(main_lyric)
+
+    lyric_groups.pop(main_group)
+    sub_lines = [(n, strip_lrc_lines(x)) for n, x in lyric_groups.items()]
+
+    if replace_empty_line:
+        for x in main_lyric:
+            if not x.lrc:
+                x.lrc = replace_empty_line
+                x.skip_merge = True
+
+    merged: list[LrcGroupLine] = []
+    for main_line in main_lyric:
+        if not main_line.lrc:
+            continue
+
+        main_time = main_line.time
+        line_main_group = (
+            skip_merge_group_name
+            if main_line.skip_merge and skip_merge_group_name
+            else main_group
+        )
+        line_group = LrcGroupLine(
+            time=main_time,
+            lrc={line_main_group: main_line.lrc},
+        )
+
+        for group, sub_lrc in sub_lines:
+            for i, line in enumerate(sub_lrc):
+                if (not line.lrc) or main_line.skip_merge:
+                    continue
+
+                if (main_time - threshold) <= line.time < (main_time + threshold):
+                    for _ in range(i + 1):
+                        it = sub_lrc.pop(0)  # noqa: B909
+                        if it.lrc:
+                            line_group.lrc[group] = it.lrc
+                    break
+
+        merged.append(line_group)
+
+    rest_lrc_len = max(len(x[1]) for x in sub_lines) if sub_lines else 0
+    if rest_lrc_len:
+        extra_lines = [
+            LrcGroupLine(time=merged[-1].time + 1000, lrc={})
+            for _ in range(rest_lrc_len)
+        ]
+        for group, line in sub_lines:
+            for target, extra in zip(extra_lines, line):
+                target.lrc[group] = extra.lrc
+
+    return merged
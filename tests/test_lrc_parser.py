@@ -0,0 +1,143 @@
+import random
+from typing import Any
+
+import pytest
+
+LineSpec = tuple[int, str, bool]
+"""(time, lyric, skip merge)"""
+
+TEXTS = ("", " ", "a", " b ", "c c", "　d", "作词 x")
+STEPS = (0, 10, 15, 25, 100, 500, 1000, 3000)
+
+LRC_MILLIS = ("", ".5", ".05", ".50", ".123", ":45", ".1234", ".00")
+LRC_TEXTS = ("", "  ", "hello　world ", "作词 : x", "歌\r", "w")
+
+
+def random_lines(rnd: random.Random, count: int, jitter: int) -> list[LineSpec]:
+    # sorted by time, as `parse_lrc` returns
+    lines: list[LineSpec] = []
+    time = rnd.randint(0, 2000)
+    for _ in range(count):
+        time += rnd.choice(STEPS)
+        text = rnd.choice(TEXTS) if rnd.random() < 0.3 else f"l{rnd.randint(0, 99)}"
+        lines.append(
+            (max(time + rnd.randint(-jitter, jitter), 0), text, rnd.random() < 0.1),
+        )
+    lines.sort(key=lambda x: x[0])
+    return lines
+
+
+def random_case(rnd: random.Random) -> tuple[dict[str, list[LineSpec]], dict[str, Any]]:
+    groups = {"main": random_lines(rnd, rnd.randint(1, 30), 5)}
+    for name in rnd.sample(("roma", "trans"), rnd.randint(0, 2)):
+        groups[name] = random_lines(rnd, rnd.randint(0, 40), 30)
+    kwargs = {
+        "main_group": rnd.choice((None, "main")),
+        "threshold": rnd.choice((1, 20, 50, 500, 1000)),
+        "replace_empty_line": rnd.choice((None, "", "-")),
+        "skip_merge_group_name": rnd.choice((None, "meta")),
+    }
+    return groups, kwargs
+
+
+def run_merge(merge: Any, groups: dict[str, list[LineSpec]], kwargs: dict[str, Any]):
+    from nonebot_plugin_multincm.utils.lrc_parser import LrcLine
+
+    lines = {k: [LrcLine(*x) for x in v] for k, v in groups.items()}
+    return [(x.time, x.lrc) for x in merge(lines, **kwargs)]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_merge_lrc_matches_reference(seed: int):
+    from nonebot_plugin_multincm.utils.lrc_parser import merge_lrc
+
+    from .lrc_reference import merge_lrc as reference_merge_lrc
+
+    rnd = random.Random(seed)
+    checked = 0
+    for _ in range(1000):
+        groups, kwargs = random_case(rnd)
+        try:
+            expected = run_merge(reference_merge_lrc, groups, kwargs)
+        except Exception:
+            # the reference crashes on groups with no lyric text at all,
+            # nothing to compare with
+            continue
+        assert run_merge(merge_lrc, groups, kwargs) == expected, (groups, kwargs)
+        checked += 1
+    assert checked > 500
+
+
+def test_merge_lrc_does_not_mutate_input():
+    from nonebot_plugin_multincm.utils.lrc_parser import LrcLine, merge_lrc
+
+    main = [LrcLine(0, " a "), LrcLine(1000, ""), LrcLine(2000, "b")]
+    trans = [LrcLine(5, " ta "), LrcLine(2010, "tb")]
+    merged = merge_lrc({"main": main, "trans": trans}, replace_empty_line="-")
+
+    assert [(x.time, x.lrc) for x in merged] == [
+        (0, {"main": "a", "trans": "ta"}),
+        (1000, {"main": "-"}),
+        (2000, {"main": "b", "trans": "tb"}),
+    ]
+    assert [(x.lrc, x.skip_merge) for x in main] == [
+        (" a ", False),
+        ("", False),
+        ("b", False),
+    ]
+    assert [x.lrc for x in trans] == [" ta ", "tb"]
+
+
+def random_lrc(rnd: random.Random) -> str:
+    def tag() -> str:
+        mili = rnd.choice(LRC_MILLIS)
+        meta = rnd.choice(("", "", "-1"))
+        return f"[{rnd.randint(0, 12):02d}:{rnd.randint(0, 59):02d}{mili}{meta}]"
+
+    def line() -> str:
+        r = rnd.random()
+        if r < 0.05:
+            return "[ti:title]"
+        if r < 0.1:
+            return "plain text"
+        if r < 0.13:
+            return ""
+        tags = "".join(tag() for _ in range(rnd.choice((1, 1, 1, 2, 3))))
+        return tags + rnd.choice(LRC_TEXTS)
+
+    return "\n".join(line() for _ in range(rnd.randint(0, 40)))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"ignore_empty": True}, {"merge_empty": False}],
+)
+def test_parse_lrc_matches_reference(kwargs: dict[str, Any]):
+    from nonebot_plugin_multincm.utils.lrc_parser import parse_lrc
+
+    from .lrc_reference import parse_lrc as reference_parse_lrc
+
+    rnd = random.Random(0)
+    for _ in range(1000):
+        lrc = random_lrc(rnd)
+        expected = reference_parse_lrc(lrc, **kwargs)
+        parsed = parse_lrc(lrc, **kwargs)
+        assert len(parsed) == len(expected), lrc
+        for x, y in zip(parsed, expected):
+            # reference goes through float and may round down by 1ms
+            assert (x.lrc, x.skip_merge) == (y.lrc, y.skip_merge), lrc
+            assert 0 <= x.time - y.time <= 1, lrc
+
+
+def test_parse_lrc_integer_time():
+    from nonebot_plugin_multincm.utils.lrc_parser import parse_lrc
+
+    parsed = parse_lrc("[00:12.123]a\n[01:02.5]b\n[01:02:45]c\n[02:00.1234]d")
+    assert [x.time for x in parsed] == [12123, 62450, 62500, 120123]
+
+
+def test_parse_lrc_ignores_tags_in_text():
+    from nonebot_plugin_multincm.utils.lrc_parser import parse_lrc
+
+    parsed = parse_lrc("[00:01.00]see [00:09.00] here")
+    assert [(x.time, x.lrc) for x in parsed] == [(1000, "see [00:09.00] here")]
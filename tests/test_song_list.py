@@ -0,0 +1,160 @@
+import asyncio
+from collections.abc import Iterable
+from typing import Any
+from typing_extensions import Self, override
+
+import pytest
+
+TOTAL_COUNT = 45
+"""3 pages with default `list_limit` (20), last page has 5 items"""
+
+
+def make_stub_song_list(total_count: int = TOTAL_COUNT):
+    from nonebot_plugin_multincm.data_source import (
+        BaseSongList,
+        BaseSongListPage,
+        ListPageCard,
+    )
+    from nonebot_plugin_multincm.utils import calc_min_max_index
+
+    class StubSongListPage(BaseSongListPage[Any, Any]):
+        @override
+        @classmethod
+        async def transform_resp_to_list_card(cls, resp: int) -> ListPageCard:
+            return ListPageCard(cover="", title=str(resp))
+
+    class StubSongList(BaseSongList[list[int], Any, int]):
+        child_calling = "测试"
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.requested_pages: list[int] = []
+
+        @override
+        def __eq__(self, value: object, /) -> bool:
+            return value is self
+
+        @override
+        async def _extract_resp_content(self, resp: list[int]) -> list[int] | None:
+            return resp or None
+
+        @override
+        async def _extract_total_count(self, resp: list[int]) -> int:
+            return total_count
+
+        @override
+        async def _do_get_page(self, page: int) -> list[int]:
+            self.requested_pages.append(page)
+            min_index, max_index = calc_min_max_index(page)
+            return list(range(min_index, min(max_index, total_count)))
+
+        @override
+        async def _build_selection(self, resp: int) -> int:
+            return resp
+
+        @override
+        async def _build_list_page(self, resp: Iterable[int]) -> StubSongListPage:
+            return StubSongListPage(list(resp), self)
+
+        async def wait_prefetch(self) -> Self:
+            await asyncio.gather(*self._prefetch_tasks.values())
+            return self
+
+    return StubSongList()
+
+
+async def test_back_to_visited_page():
+    song_list = make_stub_song_list()
+    await song_list.get_page(1)
+    await song_list.get_page(2)
+    page = await song_list.get_page(1)
+
+    assert song_list.requested_pages == [1, 2]
+    assert list(page.content) == list(range(20))  # type: ignore
+
+
+async def test_move_onto_prefetched_page():
+    song_list = make_stub_song_list()
+    await song_list.get_page(1)
+    song_list.prefetch()
+    await song_list.wait_prefetch()
+    assert song_list.requested_pages == [1, 2]
+
+    song_list.current_page += 1
+    page = await song_list.get_page()
+
+    assert song_list.requested_pages == [1, 2]
+    assert list(page.content) == list(range(20, 40))  # type: ignore
+
+
+async def test_prefetch_callback_receives_page():
+    song_list = make_stub_song_list()
+    await song_list.get_page(1)
+    received: list[Any] = []
+
+    async def callback(page: Any):
+        received.append(page)
+
+    song_list.prefetch(callback)
+    await song_list.wait_prefetch()
+
+    assert [x.page for x in received] == [2]
+    assert song_list.current_page == 1
+
+
+async def test_select_from_visited_page():
+    song_list = make_stub_song_list()
+    await song_list.get_page(1)
+    await song_list.get_page(2)
+
+    assert await song_list.select(5) == 5
+    assert await song_list.select(25) == 25
+    assert song_list.requested_pages == [1, 2]
+
+
+async def test_select_from_page_cache():
+    song_list = make_stub_song_list()
+    await song_list.get_page(2)
+    await song_list.get_page(1)
+    # item cache only, page cache should still serve it
+    song_list._cache.clear()
+
+    assert await song_list.select(25) == 25
+    assert song_list.requested_pages == [2, 1]
+
+
+async def test_state_updated_on_cache_hit():
+    song_list = make_stub_song_list()
+    await song_list.get_page(1)
+    await song_list.get_page(2)
+    song_list._total_count = None
+
+    await song_list.get_page(1)
+
+    assert song_list.current_page == 1
+    assert song_list._total_count == TOTAL_COUNT
+    assert song_list.requested_pages == [1, 2]
+
+
+async def test_short_last_page():
+    song_list = make_stub_song_list()
+    page = await song_list.get_page(3)
+    assert list(page.content) == list(range(40, 45))  # type: ignore
+    assert song_list.is_last_page
+
+    await song_list.get_page(1)
+    page = await song_list.get_page(3)
+
+    assert list(page.content) == list(range(40, 45))  # type: ignore
+    assert await song_list.select(44) == 44
+    assert song_list.requested_pages == [3, 1]
+    assert not song_list.index_valid(TOTAL_COUNT)
+
+
+async def test_select_out_of_range():
+    song_list = make_stub_song_list()
+    await song_list.get_page(1)
+
+    with pytest.raises(ValueError, match="out of range"):
+        await song_list.select(TOTAL_COUNT + 20)
+    assert song_list.requested_pages == [1]